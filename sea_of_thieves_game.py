@@ -1,19 +1,289 @@
 from __future__ import annotations
 
+import bisect
 import functools
-from typing import List
+import itertools
+import os
+import re
+import sys
+import time
+import weakref
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, TextIO, Tuple, Union
 
-import random
+from random import Random
 
 from dataclasses import dataclass
 
-from Options import Toggle
+from Options import OptionSet, Toggle
+from Utils import cache_path
 
 from ..game import Game
 from ..game_objective_template import GameObjectiveTemplate
 
 from ..enums import KeymastersKeepGamePlatforms
 
+# Optional content, by bit position. Entries and templates tagged with content are only generated for players who
+# have it (SeaOfThievesOwnedContent). Content names are referenced by the catalog file but defined here, with the option
+# that selects them, since a player's owned content is stored as a bit mask and a bit's meaning must never change
+CONTENT: Tuple[str, ...] = (
+    "A Pirate's Life",
+    "Monkey Island",
+    "Sunken Kingdom",
+    "Hourglass"
+)
+
+ALL_CONTENT: int = (1 << len(CONTENT)) - 1
+
+def content_mask(names: Sequence[str]) -> int:
+    mask: int = 0
+    for name in names:
+        mask |= 1 << CONTENT.index(name)
+
+    return mask
+
+# The templates, their pools and everything tuned per season live in the catalog file shipped next to this module.
+# It is compiled once into plain tuples and dicts, which are pickled to Archipelago's cache directory under the file's
+# SHA-256, so later startups skip parsing and validation entirely. Bump CATALOG_CACHE_VERSION whenever the compiled
+# form changes.
+# Archipelago imports every game module at startup, so nothing here runs at import: the file is loaded on first use,
+# and the modules only needed for that (json, pickle, hashlib, pkgutil) are imported there too
+CATALOG_DATA_FILE: str = "sea_of_thieves_catalog.json"
+CATALOG_CACHE_FILE: Tuple[str, ...] = ("keymasters_keep", "sea_of_thieves_catalog.pickle")
+CATALOG_CACHE_VERSION: int = 3
+
+# Template data references either a pool by name, the option dependent "factions" pool or a number range
+FACTIONS_POOL: str = "factions"
+RANGE_POOLS: Tuple[str, ...] = ("short_int", "long_int")
+
+class SeaOfThievesCatalogData(NamedTuple):
+    """
+    The loaded catalog file. Pool entries are interned and an entry's position in its pool is its stable ID, so only
+    ever append to the pools in the file; objective records and serialized seeds store the positions. entries holds
+    each pool as listed, pools the same with entry weights applied. Entry content and weights are keyed by pool, then
+    entry; a pool's weights are (weight by entry, weight of the entries not listed)
+    """
+
+    entries: Dict[str, Tuple[str, ...]]
+    pools: Dict[str, Sequence[str]]
+    all_factions: Tuple[str, ...]
+    groups: Dict[str, Tuple[Tuple[Any, ...], ...]]
+    faction_groups: Tuple[str, ...]
+    entry_content: Dict[str, Dict[str, int]]
+    entry_weights: Dict[str, Tuple[Dict[str, int], int]]
+    objective_minutes: Dict[str, int]
+    default_minutes: int
+    default_time_consuming_minutes: int
+    template_entities: Dict[str, Tuple[str, ...]]
+    template_content: Dict[str, int]
+    digest: str
+
+    @staticmethod
+    def compile(document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validates the parsed catalog file and reduces it to builtins only, so the result pickles without referencing
+        this module. Templates become (label, ((key, pool reference), ...), is_time_consuming, is_difficult, weight)
+        """
+
+        pools: Dict[str, Tuple[str, ...]] = {name: tuple(entries) for name, entries in document["pools"].items()}
+        for name in ("base_factions", "pvp_factions"):
+            if name not in pools:
+                raise ValueError(f"SoT catalog is missing the {name} pool")
+
+        groups: Dict[str, Tuple[Tuple[Any, ...], ...]] = dict()
+        faction_groups: List[str] = list()
+        objective_minutes: Dict[str, int] = dict()
+        template_entities: Dict[str, Tuple[str, ...]] = dict()
+        template_content: Dict[str, int] = dict()
+
+        for group, templates in document["groups"].items():
+            specs: List[Tuple[Any, ...]] = list()
+
+            for template in templates:
+                label: str = template["label"]
+                data: List[Tuple[str, Any]] = list()
+
+                for key, reference in template.get("data", {}).items():
+                    if isinstance(reference, dict):
+                        ((function, arguments),) = reference.items()
+                        if function not in RANGE_POOLS:
+                            raise ValueError(f"Unknown SoT number range {function} in '{label}'")
+                        reference = (function, *arguments)
+                    elif reference == FACTIONS_POOL:
+                        if group not in faction_groups:
+                            faction_groups.append(group)
+                    elif reference not in pools:
+                        raise ValueError(f"Unknown SoT pool {reference} in '{label}'")
+
+                    data.append((key, reference))
+
+                specs.append((
+                    label,
+                    tuple(data),
+                    bool(template.get("is_time_consuming", False)),
+                    bool(template.get("is_difficult", False)),
+                    int(template.get("weight", 1))
+                ))
+
+                if "minutes" in template:
+                    objective_minutes[label] = int(template["minutes"])
+                if "entities" in template:
+                    template_entities[label] = tuple(template["entities"])
+                if "content" in template:
+                    template_content[label] = content_mask(template["content"])
+
+            groups[group] = tuple(specs)
+
+        # Tags are scoped to a pool, so an entry name reused by another pool is never filtered by accident
+        entry_content: Dict[str, Dict[str, int]] = dict()
+        for name, tags in document.get("entry_content", {}).items():
+            if name not in pools:
+                raise ValueError(f"Unknown SoT pool {name} in entry content")
+
+            masks: Dict[str, int] = entry_content.setdefault(name, dict())
+            for content, entries in tags.items():
+                for entry in entries:
+                    if entry not in pools[name]:
+                        raise ValueError(f"Entry '{entry}' tagged {content} is not in the SoT pool {name}")
+                    masks[entry] = masks.get(entry, 0) | content_mask((content,))
+
+        # Pools without weights draw their entries evenly
+        entry_weights: Dict[str, Tuple[Dict[str, int], int]] = dict()
+        for name, tuning in document.get("entry_weights", {}).items():
+            if name not in pools:
+                raise ValueError(f"Unknown SoT pool {name} in entry weights")
+
+            weights: Dict[str, int] = {entry: int(weight) for entry, weight in tuning.get("entries", {}).items()}
+            default_weight: int = int(tuning.get("default", 1))
+            for entry in weights:
+                if entry not in pools[name]:
+                    raise ValueError(f"Weighted entry '{entry}' is not in the SoT pool {name}")
+            if min(weights.values(), default=default_weight) < 1 or default_weight < 1:
+                raise ValueError(f"SoT entry weights for {name} must be positive integers")
+
+            entry_weights[name] = (weights, default_weight)
+
+        return {
+            "pools": pools,
+            "groups": groups,
+            "faction_groups": tuple(faction_groups),
+            "entry_content": entry_content,
+            "entry_weights": entry_weights,
+            "objective_minutes": objective_minutes,
+            "default_minutes": int(document["default_minutes"]),
+            "default_time_consuming_minutes": int(document["default_time_consuming_minutes"]),
+            "template_entities": template_entities,
+            "template_content": template_content,
+        }
+
+    @classmethod
+    def from_compiled(cls, compiled: Dict[str, Any], digest: str) -> SeaOfThievesCatalogData:
+        fields: Dict[str, Any] = dict(compiled)
+
+        entries: Dict[str, Tuple[str, ...]] = {
+            name: tuple(sys.intern(entry) for entry in pool) for name, pool in compiled["pools"].items()
+        }
+        fields["entries"] = entries
+        fields["pools"] = {
+            name: weighted_pool(pool, *compiled["entry_weights"].get(name, ({}, 1)))
+            for name, pool in entries.items()
+        }
+        fields["all_factions"] = entries["base_factions"] + entries["pvp_factions"]
+
+        return cls(**fields, digest=digest)
+
+def read_catalog_file() -> bytes:
+    import pkgutil
+
+    # Through the package loader when there is one, so the file is also found inside a zipped world
+    data: Optional[bytes] = None
+    if __package__:
+        try:
+            data = pkgutil.get_data(__package__, CATALOG_DATA_FILE)
+        except (ImportError, ValueError):
+            data = None
+
+    if data is None:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), CATALOG_DATA_FILE), "rb") as file:
+            data = file.read()
+
+    return data
+
+@functools.lru_cache(maxsize=None)
+def catalog_data() -> SeaOfThievesCatalogData:
+    """
+    The catalog file, compiled on first use. A cached compiled form is used when it was built from the same file
+    contents by the same CATALOG_CACHE_VERSION; otherwise the file is parsed and the cache rewritten. The cache is
+    only an optimization, so any failure reading or writing it falls back to parsing
+    """
+
+    import hashlib
+    import pickle
+
+    raw: bytes = read_catalog_file()
+    digest: str = hashlib.sha256(b"%d\n" % CATALOG_CACHE_VERSION + raw).hexdigest()
+    path: str = cache_path(*CATALOG_CACHE_FILE)
+
+    compiled: Optional[Dict[str, Any]] = None
+    try:
+        with open(path, "rb") as file:
+            cached_digest, cached = pickle.load(file)
+        if cached_digest == digest:
+            compiled = cached
+    except Exception:
+        compiled = None
+
+    if compiled is None:
+        import json
+
+        compiled = SeaOfThievesCatalogData.compile(json.loads(raw.decode("utf-8")))
+
+        # Written under a unique name then renamed, so concurrent workers never read a partial cache
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary: str = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                pickle.dump((digest, compiled), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    return SeaOfThievesCatalogData.from_compiled(compiled, digest)
+
+@functools.lru_cache(maxsize=None)
+def owned_entries(name: str, owned_content: int) -> Tuple[str, ...]:
+    """
+    The entries of the named pool that need no content missing from owned_content, in pool order
+    """
+
+    data: SeaOfThievesCatalogData = catalog_data()
+    missing: int = ALL_CONTENT & ~owned_content
+    entry_content: Dict[str, int] = data.entry_content.get(name, {})
+
+    return tuple(entry for entry in data.entries[name] if not entry_content.get(entry, 0) & missing)
+
+def weighted_pool(pool: Tuple[str, ...], entry_weights: Dict[str, int], default_weight: int) -> Sequence[str]:
+    """
+    The pool with entry weights applied, or the pool itself when all its entries weigh the same. An entry with weight
+    n is drawn as if it were listed n times; entries without a weight count as default_weight
+    """
+
+    weights: List[int] = [entry_weights.get(entry, default_weight) for entry in pool]
+    if len(set(weights)) <= 1:
+        return pool
+
+    return SeaOfThievesWeightedPool(pool, weights)
+
+@functools.lru_cache(maxsize=None)
+def owned_pool(name: str, owned_content: int) -> Sequence[str]:
+    """
+    The named pool restricted to owned_content, with its entry weights applied
+    """
+
+    data: SeaOfThievesCatalogData = catalog_data()
+
+    return weighted_pool(owned_entries(name, owned_content), *data.entry_weights.get(name, ({}, 1)))
+
 @dataclass
 class SeaOfThievesArchipelagoOptions:
     sea_of_thieves_include_pvp: SeaOfThievesIncludePVP
@@ -21,6 +291,1307 @@ class SeaOfThievesArchipelagoOptions:
     sea_of_thieves_include_tall_tales: SeaOfThievesIncludeTallTales
     sea_of_thieves_include_emergent_events: SeaOfThievesIncludeEmergentEvents
     sea_of_thieves_include_social: SeaOfThievesIncludeSocial
+    sea_of_thieves_owned_content: SeaOfThievesOwnedContent
+
+class SeaOfThievesOptionSet(NamedTuple):
+    """
+    Hashable snapshot of the SoT options (5 toggles and the owned content mask), used to key the shared template catalogs
+    """
+
+    include_pvp: bool
+    include_fishing: bool
+    include_tall_tales: bool
+    include_emergent_events: bool
+    include_social: bool
+    owned_content: int = ALL_CONTENT
+
+    TOGGLE_COUNT = 5
+
+    def to_bits(self) -> int:
+        """
+        The 5 toggles as bits; owned_content is already a mask of its own
+        """
+
+        return sum(1 << i for i, value in enumerate(self[:self.TOGGLE_COUNT]) if value)
+
+    @classmethod
+    def from_bits(cls, bits: int, owned_content: int = ALL_CONTENT) -> SeaOfThievesOptionSet:
+        return cls(*(bool(bits >> i & 1) for i in range(cls.TOGGLE_COUNT)), owned_content)
+
+# Compact objective set encoding: MAGIC, version byte, option bits byte, catalog fingerprint (4 bytes, little endian),
+# varint owned content mask, varint objective count, then per objective a varint template ID followed by one varint
+# pool index per placeholder. INT placeholders store their rank in the range, never the number itself, so the
+# fingerprint covers each range's minimum and step along with the labels. Template IDs, pool indices and the
+# fingerprint are always the full content catalog's, whatever the owned content mask, so editing content tags never
+# changes what saved data decodes to
+SERIALIZATION_MAGIC: bytes = b"SoT"
+SERIALIZATION_VERSION: int = 1
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value: int = 0
+    shift: int = 0
+
+    while True:
+        if position >= len(data):
+            raise ValueError("Truncated SoT objective data")
+
+        byte: int = data[position]
+        position += 1
+
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+
+        shift += 7
+
+class SeaOfThievesLabel:
+    """
+    A template label split once into literal segments around its placeholders. Placeholders are matched as whole
+    tokens, so FACTION never matches inside HG_FACTION, and rendering is a single join instead of a replace per key
+    """
+
+    __slots__ = ("segments", "slot_order")
+
+    segments: Tuple[str, ...]
+    slot_order: Tuple[int, ...]
+
+    def __init__(self, label: str, keys: Sequence[str]) -> None:
+        segments: List[str] = list()
+        slot_order: List[int] = list()
+
+        if keys:
+            # Longest first so a key that contains another key wins the match
+            pattern: re.Pattern = re.compile(
+                "(?<![A-Z_])(" + "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True)) + ")(?![A-Z_])"
+            )
+
+            remaining: Dict[str, int] = {key: i for i, key in enumerate(keys)}
+            start: int = 0
+            for match in pattern.finditer(label):
+                # Like Keymaster's Keep, only a key's first occurrence is substituted
+                slot: Optional[int] = remaining.pop(match.group(1), None)
+                if slot is None:
+                    continue
+
+                segments.append(label[start:match.start()])
+                slot_order.append(slot)
+                start = match.end()
+
+            segments.append(label[start:])
+        else:
+            segments.append(label)
+
+        self.segments = tuple(segments)
+        self.slot_order = tuple(slot_order)
+
+    def render(self, values: Sequence[Any]) -> str:
+        if not self.slot_order:
+            return self.segments[0]
+
+        parts: List[str] = [self.segments[0]]
+        for slot, segment in zip(self.slot_order, self.segments[1:]):
+            parts.append(str(values[slot]))
+            parts.append(segment)
+
+        return "".join(parts)
+
+class SeaOfThievesObjective(NamedTuple):
+    """
+    A resolved objective as small ints: the template's position in its catalog and, per placeholder, the chosen
+    entry's position in its pool
+    """
+
+    template_id: int
+    data: Tuple[int, ...]
+
+class SeaOfThievesBucket(NamedTuple):
+    """
+    A set of catalog templates and the sum of their weights
+    """
+
+    template_ids: Tuple[int, ...]
+    total_weight: int
+
+class SeaOfThievesGeneratedObjective(NamedTuple):
+    """
+    A rendered objective together with the entry chosen for each placeholder
+    """
+
+    label: str
+    data: Dict[str, Any]
+    objective: SeaOfThievesObjective
+
+class SeaOfThievesPlan(NamedTuple):
+    """
+    Objectives picked to fit a play time budget, with their estimated total minutes
+    """
+
+    objectives: List[SeaOfThievesObjective]
+    minutes: int
+
+class SeaOfThievesOverlapPolicy(NamedTuple):
+    """
+    How much slots sharing an objective registry may overlap. An objective (by rendered label) goes to at most
+    max_shared slots while unused ones remain. A candidate touching entities other slots already hold (a faction, a
+    fish, ...) is still taken with probability entity_weight ** shared entities; 1.0 ignores entities
+    """
+
+    max_shared: int = 1
+    entity_weight: float = 1.0
+
+class SeaOfThievesWeightedPool(Sequence):
+    """
+    Read-only pool in which each entry appears as many times as its weight, without the copies existing: index i maps
+    to an entry by binary search over the cumulative weights. Keymaster's Keep's random.sample() over it is therefore
+    a weighted pick, while the catalog samplers use entries and cum_weights directly
+    """
+
+    __slots__ = ("entries", "cum_weights")
+
+    entries: Tuple[Any, ...]
+    cum_weights: Tuple[int, ...]
+
+    def __init__(self, entries: Sequence[Any], weights: Sequence[int]) -> None:
+        if not entries or len(entries) != len(weights):
+            raise ValueError("A weighted pool needs exactly one weight per entry")
+        if any(weight < 1 for weight in weights):
+            raise ValueError("Entry weights must be positive integers")
+
+        self.entries = tuple(entries)
+        self.cum_weights = tuple(itertools.accumulate(weights))
+
+    def __len__(self) -> int:
+        return self.cum_weights[-1]
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Weighted pool index out of range")
+
+        return self.entries[bisect.bisect_right(self.cum_weights, index)]
+
+class SeaOfThievesRange(Sequence):
+    """
+    Number range of an INT placeholder: minimum up to maximum in steps of step. Ranks 0 to size - 1 map to values in
+    closed form, so samplers, the objective index and serialization only ever handle ranks, and a number becomes text
+    only when an objective is rendered. Still a Sequence of its values, for Keymaster's Keep's random.sample()
+    """
+
+    __slots__ = ("minimum", "maximum", "step", "size")
+
+    minimum: int
+    maximum: int
+    step: int
+    size: int
+
+    def __init__(self, minimum: int, maximum: int, step: int = 1) -> None:
+        if step < 1 or maximum < minimum:
+            raise ValueError(f"Invalid SoT number range {minimum} to {maximum} in steps of {step}")
+
+        self.minimum = minimum
+        self.step = step
+        self.size = (maximum - minimum) // step + 1
+        # The last value actually reached, which is below the given maximum when the step does not divide the span
+        self.maximum = minimum + (self.size - 1) * step
+
+    @classmethod
+    def from_range(cls, numbers: range) -> SeaOfThievesRange:
+        if not numbers or numbers.step < 1:
+            raise ValueError(f"Cannot use {numbers!r} as a SoT number range")
+
+        return cls(numbers[0], numbers[-1], numbers.step)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, rank: int) -> int:
+        if rank < 0:
+            rank += self.size
+        if not 0 <= rank < self.size:
+            raise IndexError("Number range rank out of range")
+
+        return self.minimum + rank * self.step
+
+    def __contains__(self, value: Any) -> bool:
+        return isinstance(value, int) and self.minimum <= value <= self.maximum and not (value - self.minimum) % self.step
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SeaOfThievesRange):
+            return NotImplemented
+
+        return (self.minimum, self.step, self.size) == (other.minimum, other.step, other.size)
+
+    def __hash__(self) -> int:
+        return hash((self.minimum, self.step, self.size))
+
+    def __repr__(self) -> str:
+        return f"SeaOfThievesRange({self.minimum}, {self.maximum}, {self.step})"
+
+    def rank(self, value: int) -> int:
+        if value not in self:
+            raise ValueError(f"{value} is not in {self!r}")
+
+        return (value - self.minimum) // self.step
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        rank: int = self.rank(value)
+        if not start <= rank < (self.size if stop is None else stop):
+            raise ValueError(f"{value} is not in {self!r}")
+
+        return rank
+
+    def count(self, value: Any) -> int:
+        return int(value in self)
+
+    def draw_ranks(self, rng: Random, count: int) -> List[int]:
+        return rng.choices(range(self.size), k=count)
+
+class SeaOfThievesAliasTable:
+    """
+    Walker/Vose alias table: weighted picks in constant time, however many items there are
+    """
+
+    __slots__ = ("items", "probabilities", "aliases")
+
+    items: Tuple[Any, ...]
+    probabilities: Tuple[float, ...]
+    aliases: Tuple[Any, ...]
+
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]) -> None:
+        if not items:
+            raise ValueError("Cannot build an alias table without items")
+
+        size: int = len(items)
+        total: float = float(sum(weights))
+        scaled: List[float] = [weight * size / total for weight in weights]
+
+        probabilities: List[float] = [1.0] * size
+        aliases: List[int] = list(range(size))
+
+        small: List[int] = [i for i, probability in enumerate(scaled) if probability < 1.0]
+        large: List[int] = [i for i, probability in enumerate(scaled) if probability >= 1.0]
+        while small and large:
+            less: int = small.pop()
+            more: int = large.pop()
+
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+
+            scaled[more] += scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left over is only off from 1 by rounding error and keeps its own item
+
+        self.items = tuple(items)
+        self.probabilities = tuple(probabilities)
+        self.aliases = tuple(self.items[alias] for alias in aliases)
+
+    def draw(self, rng: Random) -> Any:
+        # One uniform float picks both the column (integer part) and the coin flip (fractional part)
+        u: float = rng.random() * len(self.items)
+        column: int = int(u)
+
+        return self.items[column] if u - column < self.probabilities[column] else self.aliases[column]
+
+    def draws(self, rng: Random, count: int) -> List[Any]:
+        random: Callable[[], float] = rng.random
+        items: Tuple[Any, ...] = self.items
+        probabilities: Tuple[float, ...] = self.probabilities
+        aliases: Tuple[Any, ...] = self.aliases
+        size: int = len(items)
+
+        picks: List[Any] = list()
+        for _ in range(count):
+            u: float = random() * size
+            column: int = int(u)
+            picks.append(items[column] if u - column < probabilities[column] else aliases[column])
+
+        return picks
+
+class SeaOfThievesTemplateRecord:
+    """
+    Read-only compiled form of one template: its placeholders, the pools they draw from and its parsed label.
+    Built once per template object and shared by every catalog that contains the template
+    """
+
+    __slots__ = ("template", "keys", "pools", "cum_weights", "radices", "size", "label", "minutes", "entities")
+
+    template: GameObjectiveTemplate
+    keys: Tuple[str, ...]
+    pools: Tuple[Sequence[Any], ...]
+    cum_weights: Tuple[Optional[Tuple[int, ...]], ...]
+    radices: Tuple[int, ...]
+    size: int
+    label: SeaOfThievesLabel
+    minutes: int
+    entities: Tuple[str, ...]
+
+    records: Dict[int, SeaOfThievesTemplateRecord] = dict()
+
+    def __init__(self, template: GameObjectiveTemplate) -> None:
+        keys: List[str] = list()
+        pools: List[Sequence[Any]] = list()
+        cum_weights: List[Optional[Tuple[int, ...]]] = list()
+
+        for key, (collection_callable, count) in template.data.items():
+            # Objective records hold a single index per placeholder
+            if count != 1:
+                raise ValueError(f"SoT placeholder {key} in '{template.label}' must draw exactly 1 entry")
+
+            pool: Sequence[Any] = self.resolve_pool(collection_callable)
+
+            keys.append(key)
+            if isinstance(pool, SeaOfThievesWeightedPool):
+                # Indices point at distinct entries; the weights only change how often each is drawn
+                pools.append(pool.entries)
+                cum_weights.append(pool.cum_weights)
+            else:
+                pools.append(pool)
+                cum_weights.append(None)
+
+        self.template = template
+        self.keys = tuple(keys)
+        self.pools = tuple(pools)
+        self.cum_weights = tuple(cum_weights)
+        self.radices = tuple(len(pool) for pool in pools)
+
+        size: int = 1
+        for radix in self.radices:
+            size *= radix
+
+        self.size = size
+        self.label = SeaOfThievesLabel(template.label, self.keys)
+
+        data: SeaOfThievesCatalogData = catalog_data()
+
+        # Play time estimates and entities are by label; templates without an estimate take the default for their flag
+        default_minutes: int = data.default_minutes
+        if template.is_time_consuming:
+            default_minutes = data.default_time_consuming_minutes
+
+        self.minutes = data.objective_minutes.get(template.label, default_minutes)
+        self.entities = data.template_entities.get(template.label, ())
+
+    @classmethod
+    def for_template(cls, template: GameObjectiveTemplate) -> SeaOfThievesTemplateRecord:
+        # Templates are unhashable dataclasses; keying on id() is safe because the record keeps its template alive
+        record: Optional[SeaOfThievesTemplateRecord] = cls.records.get(id(template))
+
+        if record is None:
+            record = cls.records[id(template)] = cls(template)
+
+        return record
+
+    @staticmethod
+    def resolve_pool(collection_callable: Callable[[], Sequence[Any]]) -> Sequence[Any]:
+        pool: Sequence[Any] = collection_callable()
+
+        # Number ranges index in closed form, no need to expand them, and weighted pools must not be expanded
+        if isinstance(pool, (SeaOfThievesRange, SeaOfThievesWeightedPool)):
+            return pool
+        if isinstance(pool, range):
+            return SeaOfThievesRange.from_range(pool)
+
+        return tuple(pool)
+
+    @property
+    def weight(self) -> int:
+        return self.template.weight
+
+    @property
+    def is_difficult(self) -> bool:
+        return self.template.is_difficult
+
+    @property
+    def is_time_consuming(self) -> bool:
+        return self.template.is_time_consuming
+
+    @property
+    def is_weighted(self) -> bool:
+        return any(cum_weights is not None for cum_weights in self.cum_weights)
+
+    def objective_weights(self) -> List[int]:
+        """
+        Weight of each of the template's objectives, in rank order: the product of its entries' weights
+        """
+
+        columns: List[Sequence[int]] = [
+            [1] * len(pool) if cum_weights is None else
+            [weight - previous for previous, weight in zip((0,) + cum_weights, cum_weights)]
+            for pool, cum_weights in zip(self.pools, self.cum_weights)
+        ]
+
+        weights: List[int] = list()
+        for combination in itertools.product(*columns):
+            weight: int = 1
+            for entry_weight in combination:
+                weight *= entry_weight
+            weights.append(weight)
+
+        return weights
+
+    def values(self, data: Sequence[int]) -> List[Any]:
+        return [pool[index] for pool, index in zip(self.pools, data)]
+
+class SeaOfThievesObjectiveIndex:
+    """
+    Exact size of a catalog's objective space. Every distinct objective has a rank: templates are laid out in catalog
+    order, and within a template the placeholder indices count like digits with the first placeholder most significant
+    """
+
+    __slots__ = ("radices", "sizes", "offsets")
+
+    def __init__(self, records: Sequence[SeaOfThievesTemplateRecord]) -> None:
+        self.radices: Tuple[Tuple[int, ...], ...] = tuple(record.radices for record in records)
+        self.sizes: Tuple[int, ...] = tuple(record.size for record in records)
+        self.offsets: Tuple[int, ...] = tuple(itertools.accumulate(self.sizes, initial=0))
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    def count(self, template_ids: Optional[Sequence[int]] = None) -> int:
+        if template_ids is None:
+            return len(self)
+
+        return sum(self.sizes[template_id] for template_id in template_ids)
+
+    def rank(self, objective: SeaOfThievesObjective) -> int:
+        rank: int = 0
+        for radix, index in zip(self.radices[objective.template_id], objective.data):
+            if not 0 <= index < radix:
+                raise IndexError(f"Data index {index} out of range for a pool of {radix}")
+
+            rank = rank * radix + index
+
+        return self.offsets[objective.template_id] + rank
+
+    def objective(self, rank: int) -> SeaOfThievesObjective:
+        if not 0 <= rank < len(self):
+            raise IndexError(f"Objective rank {rank} out of range for {len(self)} objectives")
+
+        template_id: int = bisect.bisect_right(self.offsets, rank) - 1
+        remainder: int = rank - self.offsets[template_id]
+
+        data: List[int] = list()
+        for radix in reversed(self.radices[template_id]):
+            remainder, index = divmod(remainder, radix)
+            data.append(index)
+
+        return SeaOfThievesObjective(template_id, tuple(reversed(data)))
+
+    def objectives(self, template_ids: Optional[Sequence[int]] = None) -> Iterator[SeaOfThievesObjective]:
+        """
+        Lazily yields every distinct objective of the given templates (all by default), in rank order
+        """
+
+        if template_ids is None:
+            template_ids = range(len(self.radices))
+
+        for template_id in template_ids:
+            for data in itertools.product(*(range(radix) for radix in self.radices[template_id])):
+                yield SeaOfThievesObjective(template_id, data)
+
+class SeaOfThievesConflictIndex:
+    """
+    Entity bitsets for a catalog. Every entity (template tags and pool entries, numbers excluded) gets one bit; a
+    template and each entry of each of its pools get a mask, and an objective's mask is their OR. Two objectives
+    overlap when their masks share a bit, so checking a candidate against a whole keep is a single AND
+    """
+
+    __slots__ = ("entities", "template_masks", "entry_masks")
+
+    def __init__(self, records: Sequence[SeaOfThievesTemplateRecord]) -> None:
+        bits: Dict[str, int] = dict()
+
+        def mask(entities: Sequence[str]) -> int:
+            value: int = 0
+            for entity in entities:
+                value |= 1 << bits.setdefault(entity, len(bits))
+            return value
+
+        self.template_masks: Tuple[int, ...] = tuple(mask(record.entities) for record in records)
+        self.entry_masks: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+            tuple(
+                (0,) * len(pool) if isinstance(pool, SeaOfThievesRange) else tuple(mask((entry,)) for entry in pool)
+                for pool in record.pools
+            )
+            for record in records
+        )
+        self.entities: Tuple[str, ...] = tuple(bits)
+
+    def mask(self, objective: SeaOfThievesObjective) -> int:
+        value: int = self.template_masks[objective.template_id]
+        for entry_masks, index in zip(self.entry_masks[objective.template_id], objective.data):
+            value |= entry_masks[index]
+
+        return value
+
+    def entities_of(self, objective: SeaOfThievesObjective) -> List[str]:
+        value: int = self.mask(objective)
+
+        return [entity for bit, entity in enumerate(self.entities) if value >> bit & 1]
+
+    def conflicts(self, first: SeaOfThievesObjective, second: SeaOfThievesObjective) -> bool:
+        return bool(self.mask(first) & self.mask(second))
+
+class SeaOfThievesCatalog:
+    """
+    Every objective template for one option combination. Built once per combination, shared by all worlds and never
+    modified afterwards apart from the lazily filled alias table cache
+    """
+
+    __slots__ = (
+        "option_set", "templates", "records", "buckets", "filtered_buckets", "index", "conflicts", "fingerprint",
+        "full_catalog", "full_ids", "alias_tables"
+    )
+
+    STREAM_BATCH_SIZE: int = 1024
+
+    def __init__(self, option_set: SeaOfThievesOptionSet, templates: Sequence[GameObjectiveTemplate]) -> None:
+        self.option_set: SeaOfThievesOptionSet = option_set
+        self.templates: Tuple[GameObjectiveTemplate, ...] = tuple(templates)
+        self.records: Tuple[SeaOfThievesTemplateRecord, ...] = tuple(
+            SeaOfThievesTemplateRecord.for_template(template) for template in self.templates
+        )
+
+        # Templates partitioned by their (is_difficult, is_time_consuming) flags. All four buckets exist, possibly empty
+        partitions: Dict[Tuple[bool, bool], List[int]] = {
+            flags: list() for flags in itertools.product((False, True), repeat=2)
+        }
+        for template_id, record in enumerate(self.records):
+            partitions[(record.is_difficult, record.is_time_consuming)].append(template_id)
+
+        self.buckets: Dict[Tuple[bool, bool], SeaOfThievesBucket] = {
+            flags: self.bucket(template_ids) for flags, template_ids in partitions.items()
+        }
+
+        # For each (include_difficult, include_time_consuming) filter, the union of the buckets it allows, in catalog order
+        self.filtered_buckets: Dict[Tuple[bool, bool], SeaOfThievesBucket] = dict()
+        for include_difficult, include_time_consuming in itertools.product((False, True), repeat=2):
+            template_ids: List[int] = list()
+            for (is_difficult, is_time_consuming), bucket in self.buckets.items():
+                if (include_difficult or not is_difficult) and (include_time_consuming or not is_time_consuming):
+                    template_ids.extend(bucket.template_ids)
+
+            self.filtered_buckets[(include_difficult, include_time_consuming)] = self.bucket(sorted(template_ids))
+
+        self.index: SeaOfThievesObjectiveIndex = SeaOfThievesObjectiveIndex(self.records)
+        self.conflicts: SeaOfThievesConflictIndex = SeaOfThievesConflictIndex(self.records)
+
+        # CRC32 of the template labels in catalog order, which changes whenever template IDs would, and of each number
+        # range's minimum and step, which change whenever the value behind a rank would. Pools only ever grow at the
+        # end, so their entries need no fingerprint
+        self.fingerprint: int = zlib.crc32("\n".join(
+            record.template.label + "".join(
+                f"\t{key}={pool.minimum}/{pool.step}"
+                for key, pool in zip(record.keys, record.pools) if isinstance(pool, SeaOfThievesRange)
+            )
+            for record in self.records
+        ).encode("utf-8"))
+
+        # Per template, its ID in the full content catalog and, per placeholder, the full pool's index of each entry
+        # (None where the pool is not restricted). A catalog for all content is its own full catalog
+        self.full_catalog: SeaOfThievesCatalog = self
+        self.full_ids: Tuple[Tuple[int, Tuple[Optional[Tuple[int, ...]], ...]], ...] = tuple(
+            (template_id, (None,) * len(record.pools)) for template_id, record in enumerate(self.records)
+        )
+        if option_set.owned_content != ALL_CONTENT:
+            self.full_catalog = SeaOfThievesGame.catalog_for(option_set._replace(owned_content=ALL_CONTENT))
+            self.full_ids = self.map_to(self.full_catalog)
+
+        self.alias_tables: Dict[Tuple[bool, bool], SeaOfThievesAliasTable] = dict()
+
+    def map_to(
+        self,
+        full_catalog: SeaOfThievesCatalog
+    ) -> Tuple[Tuple[int, Tuple[Optional[Tuple[int, ...]], ...]], ...]:
+        full_template_ids: Dict[str, int] = {
+            record.template.label: template_id for template_id, record in enumerate(full_catalog.records)
+        }
+
+        full_ids: List[Tuple[int, Tuple[Optional[Tuple[int, ...]], ...]]] = list()
+        for record in self.records:
+            full_template_id: int = full_template_ids[record.template.label]
+
+            mappings: List[Optional[Tuple[int, ...]]] = list()
+            for pool, full_pool in zip(record.pools, full_catalog.records[full_template_id].pools):
+                if pool == full_pool:
+                    mappings.append(None)
+                    continue
+
+                positions: Dict[Any, int] = {entry: index for index, entry in enumerate(full_pool)}
+                mappings.append(tuple(positions[entry] for entry in pool))
+
+            full_ids.append((full_template_id, tuple(mappings)))
+
+        return tuple(full_ids)
+
+    def bucket(self, template_ids: Sequence[int]) -> SeaOfThievesBucket:
+        return SeaOfThievesBucket(
+            template_ids=tuple(template_ids),
+            total_weight=sum(self.records[template_id].weight for template_id in template_ids)
+        )
+
+    def template_ids(self, include_difficult: bool, include_time_consuming: bool) -> Tuple[int, ...]:
+        return self.filtered_buckets[(include_difficult, include_time_consuming)].template_ids
+
+    def alias_table(self, include_difficult: bool, include_time_consuming: bool) -> SeaOfThievesAliasTable:
+        """
+        Template picker over the templates allowed by the two flags, built on first use and kept for the catalog's lifetime
+        """
+
+        key: Tuple[bool, bool] = (include_difficult, include_time_consuming)
+
+        if key not in self.alias_tables:
+            template_ids: Tuple[int, ...] = self.template_ids(include_difficult, include_time_consuming)
+            self.alias_tables[key] = SeaOfThievesAliasTable(
+                template_ids, [self.records[template_id].weight for template_id in template_ids]
+            )
+
+        return self.alias_tables[key]
+
+    def sample_objectives(
+        self,
+        count: int,
+        rng: Random,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False
+    ) -> List[SeaOfThievesObjective]:
+        """
+        Draws count objectives at once: templates from the alias table, then every placeholder of a template in one
+        choices() call. Number ranges draw their own ranks; weighted pools pass their cumulative weights, which
+        choices() binary searches
+        """
+
+        start: float = time.perf_counter()
+        picker: SeaOfThievesAliasTable = self.alias_table(include_difficult, include_time_consuming)
+
+        positions: Dict[int, List[int]] = dict()
+        for position, template_id in enumerate(picker.draws(rng, count)):
+            positions.setdefault(template_id, []).append(position)
+
+        objectives: List[Optional[SeaOfThievesObjective]] = [None] * count
+        for template_id, template_positions in positions.items():
+            draws: int = len(template_positions)
+            record: SeaOfThievesTemplateRecord = self.records[template_id]
+            columns: List[List[int]] = [
+                pool.draw_ranks(rng, draws) if isinstance(pool, SeaOfThievesRange)
+                else rng.choices(range(radix), cum_weights=cum_weights, k=draws)
+                for pool, radix, cum_weights in zip(record.pools, record.radices, record.cum_weights)
+            ]
+
+            if not columns:
+                empty: SeaOfThievesObjective = SeaOfThievesObjective(template_id, ())
+                for position in template_positions:
+                    objectives[position] = empty
+                continue
+
+            for position, data in zip(template_positions, zip(*columns)):
+                objectives[position] = SeaOfThievesObjective(template_id, data)
+
+        if stats.enabled:
+            stats.record("samplers", "sample_objectives", time.perf_counter() - start)
+            for template_id, template_positions in positions.items():
+                stats.record("templates", self.templates[template_id].label, calls=len(template_positions))
+
+        return objectives
+
+    def sample_unique_objectives(
+        self,
+        count: int,
+        rng: Random,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False
+    ) -> List[SeaOfThievesObjective]:
+        template_ids: Tuple[int, ...] = self.template_ids(include_difficult, include_time_consuming)
+
+        available: int = self.index.count(template_ids)
+        if count > available:
+            raise ValueError(f"Requested {count} unique objectives but only {available} exist for these options")
+
+        return list(itertools.islice(self.iter_unique_objectives(rng, include_difficult, include_time_consuming), count))
+
+    def iter_unique_objectives(
+        self,
+        rng: Random,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False
+    ) -> Iterator[SeaOfThievesObjective]:
+        """
+        Yields distinct objectives without replacement until the pool is exhausted. Each objective keeps its template's
+        weight split over the template's objectives (evenly, or by entry weights), so a template is picked by its
+        remaining mass. Unused objectives of evenly split templates are dealt from a sparse Fisher-Yates shuffle, those
+        of weighted templates in an order drawn once with exponential keys. Cost per draw does not grow as the pool
+        runs out
+        """
+
+        template_ids: Tuple[int, ...] = self.template_ids(include_difficult, include_time_consuming)
+        index: SeaOfThievesObjectiveIndex = self.index
+
+        remaining: List[int] = [index.sizes[template_id] for template_id in template_ids]
+        masses: List[float] = [float(self.records[template_id].weight) for template_id in template_ids]
+        unit_masses: List[float] = [mass / size for mass, size in zip(masses, remaining)]
+        shuffles: List[Dict[int, int]] = [dict() for _ in template_ids]
+        orders: Dict[int, List[int]] = dict()
+        objective_masses: Dict[int, List[float]] = dict()
+        positions: range = range(len(template_ids))
+
+        for _ in range(index.count(template_ids)):
+            position: int = rng.choices(positions, weights=masses)[0]
+            record: SeaOfThievesTemplateRecord = self.records[template_ids[position]]
+            last: int = remaining[position] - 1
+            rank: int
+
+            if record.is_weighted:
+                # Sorting by Exp(weight) keys gives a weighted order without replacement. Drawn on the template's
+                # first pick, stored reversed so each later pick pops the end
+                if position not in orders:
+                    weights: List[int] = record.objective_weights()
+                    total: int = sum(weights)
+                    keys: List[float] = [rng.expovariate(weight) for weight in weights]
+
+                    objective_masses[position] = [record.weight * weight / total for weight in weights]
+                    orders[position] = sorted(range(len(weights)), key=keys.__getitem__, reverse=True)
+
+                rank = orders[position].pop()
+                masses[position] -= objective_masses[position][rank]
+            else:
+                # Swap-remove a random unused rank of the template without materializing its ranks
+                shuffle: Dict[int, int] = shuffles[position]
+                pick: int = rng.randint(0, last)
+                rank = shuffle.get(pick, pick)
+                shuffle[pick] = shuffle.pop(last, last)
+
+                masses[position] = unit_masses[position] * last
+
+            remaining[position] = last
+            if not last:
+                masses[position] = 0.0
+
+            if stats.enabled:
+                stats.record("samplers", "iter_unique_objectives")
+                stats.record("templates", self.templates[template_ids[position]].label)
+
+            yield index.objective(index.offsets[template_ids[position]] + rank)
+
+    def sample_compatible_objectives(
+        self,
+        count: int,
+        rng: Random,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        conflict_weight: float = 0.0
+    ) -> List[SeaOfThievesObjective]:
+        """
+        Distinct objectives that avoid sharing entities with each other. A candidate overlapping the picks so far is
+        still taken with probability conflict_weight ** shared entities (never, by default). Passed-over candidates
+        top up the result, fewest overlaps first, if the pool runs out before count
+        """
+
+        available: int = self.index.count(self.template_ids(include_difficult, include_time_consuming))
+        if count > available:
+            raise ValueError(f"Requested {count} unique objectives but only {available} exist for these options")
+
+        conflicts: SeaOfThievesConflictIndex = self.conflicts
+        chosen: List[SeaOfThievesObjective] = list()
+        deferred: List[Tuple[SeaOfThievesObjective, int]] = list()
+        used: int = 0
+
+        for objective in self.iter_unique_objectives(rng, include_difficult, include_time_consuming):
+            if len(chosen) == count:
+                break
+
+            mask: int = conflicts.mask(objective)
+            overlap: int = bin(mask & used).count("1")
+
+            if overlap and (conflict_weight <= 0.0 or rng.random() >= conflict_weight ** overlap):
+                deferred.append((objective, mask))
+                continue
+
+            chosen.append(objective)
+            used |= mask
+
+        while len(chosen) < count:
+            position: int = min(range(len(deferred)), key=lambda i: bin(deferred[i][1] & used).count("1"))
+            objective, mask = deferred.pop(position)
+
+            chosen.append(objective)
+            used |= mask
+
+        return chosen
+
+    def plan_objectives(
+        self,
+        target_minutes: int,
+        rng: Random,
+        count: Optional[int] = None,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False
+    ) -> SeaOfThievesPlan:
+        """
+        Picks distinct objectives whose estimated minutes add up to at most target_minutes, as close to it as the
+        greedy-with-repair pass gets. Without count, objectives are taken in weighted random order whenever they still
+        fit. With count, the first count draws are repaired: the longest pick is swapped for a shorter spare until the
+        plan fits, then the shortest pick for the longest spare that still fits, until no swap helps. Raises ValueError
+        for a negative target or count, or if count objectives cannot fit at all
+        """
+
+        if target_minutes < 0:
+            raise ValueError(f"Cannot plan objectives for a negative budget of {target_minutes} minutes")
+        if count is not None and count < 0:
+            raise ValueError(f"Cannot plan a negative number of objectives ({count})")
+        if count == 0:
+            return SeaOfThievesPlan([], 0)
+
+        candidates: List[SeaOfThievesObjective] = list(
+            self.iter_unique_objectives(rng, include_difficult, include_time_consuming)
+        )
+
+        def minutes(objective: SeaOfThievesObjective) -> int:
+            return self.records[objective.template_id].minutes
+
+        if count is None:
+            chosen: List[SeaOfThievesObjective] = list()
+            total: int = 0
+
+            for objective in candidates:
+                if total + minutes(objective) <= target_minutes:
+                    chosen.append(objective)
+                    total += minutes(objective)
+
+            return SeaOfThievesPlan(chosen, total)
+
+        if count > len(candidates):
+            raise ValueError(f"Requested {count} unique objectives but only {len(candidates)} exist for these options")
+
+        chosen = candidates[:count]
+        total = sum(minutes(objective) for objective in chosen)
+
+        # Unused objectives grouped by estimate, in draw order. Estimates only take a handful of distinct values
+        spares: Dict[int, List[SeaOfThievesObjective]] = dict()
+        for objective in candidates[count:]:
+            spares.setdefault(minutes(objective), []).append(objective)
+
+        def swap(position: int, spare_minutes: int) -> None:
+            nonlocal total
+
+            replaced: SeaOfThievesObjective = chosen[position]
+            chosen[position] = spares[spare_minutes].pop()
+            if not spares[spare_minutes]:
+                del spares[spare_minutes]
+
+            spares.setdefault(minutes(replaced), []).append(replaced)
+            total += spare_minutes - minutes(replaced)
+
+        # Shrink: each swap replaces the longest pick with a strictly shorter spare
+        while total > target_minutes:
+            position: int = max(range(count), key=lambda i: minutes(chosen[i]))
+            longest: int = minutes(chosen[position])
+            shorter: List[int] = [spare_minutes for spare_minutes in spares if spare_minutes < longest]
+
+            if not shorter:
+                raise ValueError(f"{count} objectives cannot fit in {target_minutes} minutes for these options")
+
+            # Prefer the smallest cut that gets back under the target, otherwise cut as much as possible
+            needed: int = longest - (total - target_minutes)
+            fitting: List[int] = [spare_minutes for spare_minutes in shorter if spare_minutes <= needed]
+            swap(position, max(fitting) if fitting else min(shorter))
+
+        # Grow: each swap replaces the shortest pick with the longest spare that still fits
+        while total < target_minutes:
+            position = min(range(count), key=lambda i: minutes(chosen[i]))
+            shortest: int = minutes(chosen[position])
+            longer: List[int] = [
+                spare_minutes for spare_minutes in spares
+                if shortest < spare_minutes <= shortest + target_minutes - total
+            ]
+
+            if not longer:
+                break
+
+            swap(position, max(longer))
+
+        return SeaOfThievesPlan(chosen, total)
+
+    def stream_objectives(
+        self,
+        rng: Random,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        limit: Optional[int] = None
+    ) -> Iterator[SeaOfThievesObjective]:
+        """
+        Yields objectives (duplicates allowed) forever or up to limit. Draws happen in batches that start at 1 and
+        double up to STREAM_BATCH_SIZE, so the first objective is immediate and memory stays bounded
+        """
+
+        batch_size: int = 1
+        produced: int = 0
+
+        while limit is None or produced < limit:
+            if limit is not None:
+                batch_size = min(batch_size, limit - produced)
+
+            yield from self.sample_objectives(batch_size, rng, include_difficult, include_time_consuming)
+
+            produced += batch_size
+            batch_size = min(batch_size * 2, self.STREAM_BATCH_SIZE)
+
+    def resolve(self, objective: SeaOfThievesObjective) -> SeaOfThievesGeneratedObjective:
+        record: SeaOfThievesTemplateRecord = self.records[objective.template_id]
+        values: List[Any] = record.values(objective.data)
+
+        return SeaOfThievesGeneratedObjective(
+            label=record.label.render(values),
+            data=dict(zip(record.keys, values)),
+            objective=objective
+        )
+
+    def encode(self, objectives: Sequence[SeaOfThievesObjective]) -> bytes:
+        buffer: bytearray = bytearray(SERIALIZATION_MAGIC)
+        buffer.append(SERIALIZATION_VERSION)
+        buffer.append(self.option_set.to_bits())
+        buffer += self.full_catalog.fingerprint.to_bytes(4, "little")
+        _write_varint(buffer, self.option_set.owned_content)
+        _write_varint(buffer, len(objectives))
+
+        for objective in objectives:
+            full_template_id, mappings = self.full_ids[objective.template_id]
+            _write_varint(buffer, full_template_id)
+            for index, mapping in zip(objective.data, mappings):
+                _write_varint(buffer, index if mapping is None else mapping[index])
+
+        return bytes(buffer)
+
+    @staticmethod
+    def decode(data: bytes) -> Tuple[SeaOfThievesCatalog, List[SeaOfThievesObjective]]:
+        """
+        Reads bytes written by encode() back into the catalog they were generated from and their objective records
+        """
+
+        header_size: int = len(SERIALIZATION_MAGIC) + 6
+        if len(data) < header_size or not data.startswith(SERIALIZATION_MAGIC):
+            raise ValueError("Not SoT objective data")
+
+        position: int = len(SERIALIZATION_MAGIC)
+        version: int = data[position]
+        if version != SERIALIZATION_VERSION:
+            raise ValueError(f"Unsupported SoT objective data version {version}")
+
+        option_bits: int = data[position + 1]
+        fingerprint: int = int.from_bytes(data[position + 2:header_size], "little")
+        position = header_size
+
+        owned_content: int
+        owned_content, position = _read_varint(data, position)
+
+        catalog: SeaOfThievesCatalog = SeaOfThievesGame.catalog_for(
+            SeaOfThievesOptionSet.from_bits(option_bits, owned_content & ALL_CONTENT)
+        )
+        if fingerprint != catalog.full_catalog.fingerprint:
+            raise ValueError("SoT objective data was written for a different template catalog")
+
+        count: int
+        count, position = _read_varint(data, position)
+
+        template_ids: Dict[int, int] = {
+            full_template_id: template_id for template_id, (full_template_id, _) in enumerate(catalog.full_ids)
+        }
+        radices: Tuple[Tuple[int, ...], ...] = catalog.full_catalog.index.radices
+        objectives: List[SeaOfThievesObjective] = list()
+        for _ in range(count):
+            full_template_id: int
+            full_template_id, position = _read_varint(data, position)
+            if full_template_id >= len(radices):
+                raise ValueError(f"Unknown SoT template ID {full_template_id}")
+
+            indices: List[int] = list()
+            for radix in radices[full_template_id]:
+                index: int
+                index, position = _read_varint(data, position)
+                if index >= radix:
+                    raise ValueError(f"SoT data index {index} out of range for a pool of {radix}")
+                indices.append(index)
+
+            # Back from the full catalog to this owned content's catalog, which may have since tagged an entry away
+            if full_template_id not in template_ids:
+                raise ValueError(f"SoT template ID {full_template_id} needs content that is not owned")
+
+            template_id: int = template_ids[full_template_id]
+            for placeholder, mapping in enumerate(catalog.full_ids[template_id][1]):
+                if mapping is None:
+                    continue
+                if indices[placeholder] not in mapping:
+                    raise ValueError(f"SoT data index {indices[placeholder]} is for an entry that is not owned")
+                indices[placeholder] = mapping.index(indices[placeholder])
+
+            objectives.append(SeaOfThievesObjective(template_id, tuple(indices)))
+
+        if position != len(data):
+            raise ValueError("Trailing bytes after SoT objective data")
+
+        return catalog, objectives
+
+    def render(self, objective: SeaOfThievesObjective) -> str:
+        record: SeaOfThievesTemplateRecord = self.records[objective.template_id]
+
+        return record.label.render(record.values(objective.data))
+
+class SeaOfThievesObjectiveRegistry:
+    """
+    Objectives handed out to the SoT slots of one crew, so each slot gets objectives complementing the others'. The
+    caller creates one registry per multiworld (or per crew within it) and passes it to every slot it coordinates;
+    nothing is shared between registries, so unrelated multiworlds in the same process never steer each other.
+    Slots are identified by the caller's slot IDs (e.g. player numbers), and a slot's objectives stay counted until
+    it is released. Objectives are tracked by rendered label and entities by name, in hash maps, so slots with
+    different options (and catalogs) still coordinate. A slot walks its catalog's weighted random order once and
+    checks each candidate with a couple of lookups, never comparing against other slots' objectives, so total cost
+    stays linear in the objectives handed out (bounded by the catalog size per slot)
+    """
+
+    __slots__ = ("policy", "label_counts", "entity_counts", "assignments")
+
+    def __init__(self, policy: SeaOfThievesOverlapPolicy = SeaOfThievesOverlapPolicy()) -> None:
+        if policy.max_shared < 1:
+            raise ValueError("An overlap policy must allow each objective for at least 1 slot")
+
+        self.policy: SeaOfThievesOverlapPolicy = policy
+        self.label_counts: Dict[str, int] = dict()
+        self.entity_counts: Dict[str, int] = dict()
+        # Slot ID -> (label, entities) of each assigned objective
+        self.assignments: Dict[Any, List[Tuple[str, Tuple[str, ...]]]] = dict()
+
+    def shared(self, label: str) -> int:
+        """
+        How many slots currently hold the objective
+        """
+
+        return self.label_counts.get(label, 0)
+
+    def assign(
+        self,
+        slot: Any,
+        catalog: SeaOfThievesCatalog,
+        count: int,
+        rng: Random,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False
+    ) -> List[SeaOfThievesObjective]:
+        """
+        Distinct objectives for slot, replacing anything it was assigned before. Candidates over the policy's
+        max_shared, or turned down for shared entities, are passed over; if the catalog runs out first they top up
+        the result, least shared first
+        """
+
+        available: int = catalog.index.count(catalog.template_ids(include_difficult, include_time_consuming))
+        if count > available:
+            raise ValueError(f"Requested {count} unique objectives but only {available} exist for these options")
+
+        self.release(slot)
+
+        max_shared: int = self.policy.max_shared
+        entity_weight: float = self.policy.entity_weight
+        label_counts: Dict[str, int] = self.label_counts
+        entity_counts: Dict[str, int] = self.entity_counts
+
+        chosen: List[Tuple[SeaOfThievesObjective, str, Tuple[str, ...]]] = list()
+        deferred: List[Tuple[int, int, int, SeaOfThievesObjective, str, Tuple[str, ...]]] = list()
+
+        for objective in catalog.iter_unique_objectives(rng, include_difficult, include_time_consuming):
+            if len(chosen) == count:
+                break
+
+            label: str = catalog.render(objective)
+            entities: Tuple[str, ...] = ()
+            overlap: int = 0
+            if entity_weight < 1.0:
+                entities = tuple(catalog.conflicts.entities_of(objective))
+                overlap = sum(1 for entity in entities if entity in entity_counts)
+
+            shared: int = label_counts.get(label, 0)
+            if shared >= max_shared or (overlap and rng.random() >= entity_weight ** overlap):
+                deferred.append((shared, overlap, len(deferred), objective, label, entities))
+                continue
+
+            chosen.append((objective, label, entities))
+
+        # Draw order breaks ties, so the top up stays reproducible
+        deferred.sort()
+        for _, _, _, objective, label, entities in deferred[:count - len(chosen)]:
+            chosen.append((objective, label, entities))
+
+        for _, label, entities in chosen:
+            label_counts[label] = label_counts.get(label, 0) + 1
+            for entity in entities:
+                entity_counts[entity] = entity_counts.get(entity, 0) + 1
+
+        self.assignments[slot] = [(label, entities) for _, label, entities in chosen]
+
+        return [objective for objective, _, _ in chosen]
+
+    def release(self, slot: Any) -> None:
+        """
+        Returns slot's objectives to the pool, e.g. before regenerating them
+        """
+
+        for label, entities in self.assignments.pop(slot, ()):
+            self.label_counts[label] -= 1
+            if not self.label_counts[label]:
+                del self.label_counts[label]
+
+            for entity in entities:
+                self.entity_counts[entity] -= 1
+                if not self.entity_counts[entity]:
+                    del self.entity_counts[entity]
+
+class SeaOfThievesStats:
+    """
+    Opt-in call counts and cumulative time for SoT objective generation: game_objective_templates(), every data
+    callable, every template that generates an objective, and this module's samplers. A label a template produces
+    again for the same keep (the random passed to generate_game_objective) counts as a rejected duplicate, since
+    Keymaster's Keep throws repeats within a keep away and redraws. Seen labels are held per keep and dropped with
+    its random. Sampler output is never rejected, so it only shows up in the sampler and template counts.
+    Enabling or disabling drops the cached catalogs, so turn it on before any SoT world generates
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.timings: Dict[str, Dict[str, List[float]]] = dict()
+        self.labels: weakref.WeakKeyDictionary[Random, Set[str]] = weakref.WeakKeyDictionary()
+        self.objectives: int = 0
+        self.duplicates: int = 0
+
+    def enable(self) -> None:
+        self.enabled = True
+        SeaOfThievesGame.clear_catalog_caches()
+
+    def disable(self) -> None:
+        self.enabled = False
+        SeaOfThievesGame.clear_catalog_caches()
+
+    def record(self, category: str, name: str, seconds: float = 0.0, calls: int = 1) -> None:
+        timing: List[float] = self.timings.setdefault(category, dict()).setdefault(name, [0, 0.0])
+        timing[0] += calls
+        timing[1] += seconds
+
+    def record_objective(self, label: str, keep: Optional[Random] = None) -> None:
+        """
+        Counts an objective generated for keep. Without a keep there is nothing to compare against, so it is never a
+        duplicate
+        """
+
+        self.objectives += 1
+
+        if keep is None:
+            return
+
+        labels: Set[str] = self.labels.setdefault(keep, set())
+        if label in labels:
+            self.duplicates += 1
+        else:
+            labels.add(label)
+
+    def forget(self, keep: Random) -> None:
+        """
+        Drops the labels seen for keep, e.g. when its world is done generating
+        """
+
+        self.labels.pop(keep, None)
+
+    def instrument_callable(self, collection_callable: Callable[[], Sequence[Any]]) -> Callable[[], Sequence[Any]]:
+        name: str
+        if isinstance(collection_callable, functools.partial) and collection_callable.func in (
+            SeaOfThievesGame.pool, owned_pool
+        ):
+            name = collection_callable.args[0]
+        elif isinstance(collection_callable, functools.partial):
+            name = f"{collection_callable.func.__name__}{collection_callable.args}"
+        else:
+            name = collection_callable.__name__
+
+        def timed() -> Sequence[Any]:
+            start: float = time.perf_counter()
+            collection: Sequence[Any] = collection_callable()
+            self.record("data", name, time.perf_counter() - start)
+
+            return collection
+
+        return timed
+
+    def instrument_templates(self, templates: Sequence[GameObjectiveTemplate]) -> List[GameObjectiveTemplate]:
+        return [
+            SeaOfThievesInstrumentedTemplate(
+                label=template.label,
+                data={
+                    key: (self.instrument_callable(collection_callable), count)
+                    for key, (collection_callable, count) in template.data.items()
+                },
+                is_time_consuming=template.is_time_consuming,
+                is_difficult=template.is_difficult,
+                weight=template.weight
+            )
+            for template in templates
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            category: {name: {"calls": int(calls), "seconds": seconds} for name, (calls, seconds) in timings.items()}
+            for category, timings in self.timings.items()
+        }
+
+        report["objectives"] = self.objectives
+        report["duplicates"] = self.duplicates
+        report["duplicate_rate"] = self.duplicates / self.objectives if self.objectives else 0.0
+
+        return report
+
+    def dump_json(self, destination: Union[str, TextIO]) -> None:
+        import json
+
+        if isinstance(destination, str):
+            with open(destination, "w", encoding="utf-8") as file:
+                json.dump(self.as_dict(), file, indent=2)
+        else:
+            json.dump(self.as_dict(), destination, indent=2)
+
+stats: SeaOfThievesStats = SeaOfThievesStats()
+
+# SEA_OF_THIEVES_STATS=<path> turns stats on for the whole process and writes them to <path> on exit
+if os.environ.get("SEA_OF_THIEVES_STATS"):
+    import atexit
+
+    stats.enabled = True
+    atexit.register(stats.dump_json, os.environ["SEA_OF_THIEVES_STATS"])
+
+class SeaOfThievesInstrumentedTemplate(GameObjectiveTemplate):
+    """
+    Template that reports each objective it generates to the stats. Only built while stats are enabled
+    """
+
+    def generate_game_objective(self, *args: Any, **kwargs: Any) -> Any:
+        start: float = time.perf_counter()
+        objective: Any = super().generate_game_objective(*args, **kwargs)
+        stats.record("templates", self.label, time.perf_counter() - start)
+
+        # Keymaster's Keep returns the label, possibly alongside extra data, and passes the keep's random first
+        keep: Optional[Random] = args[0] if args else kwargs.get("random")
+        stats.record_objective(objective[0] if isinstance(objective, tuple) else objective, keep)
+
+        return objective
 
 class SeaOfThievesGame(Game):
     name = "Sea of Thieves"
@@ -36,310 +1607,269 @@ class SeaOfThievesGame(Game):
 
     options_cls = SeaOfThievesArchipelagoOptions
 
-    def game_objective_templates(self) -> List[GameObjectiveTemplate]:
-        templates: List[GameObjectiveTemplate] = [
-            # Gold Hoarder Standard Voyages
-            GameObjectiveTemplate(
-                label="Complete a Gold Hoarder GH_VOYAGE voyage",
-                data={
-                    "GH_VOYAGE": (self.gh_voyages, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Order of Souls Standard Voyages
-            GameObjectiveTemplate(
-                label="Complete an Order of Souls OOS_VOYAGE voyage",
-                data={
-                    "OOS_VOYAGE": (self.oos_voyages, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Merchant Alliance Standard Voyages
-            GameObjectiveTemplate(
-                label="Complete a Merchant Alliance MA_VOYAGE voyage",
-                data={
-                    "MA_VOYAGE": (self.ma_voyages, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Hunter's Call Standard Voyages
-            GameObjectiveTemplate(
-                label="Complete a Hunter's Call HC_VOYAGE voyage",
-                data={
-                    "HC_VOYAGE": (self.hc_voyages, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Athena's Fortune Standard Voyages
-            GameObjectiveTemplate(
-                label="Complete an Athena's Fortune AF_VOYAGE voyage",
-                data={
-                    "AF_VOYAGE": (self.af_voyages, 1)
-                },
-                is_time_consuming=True,
-                is_difficult=False,
-                weight=3
-            ),
-            # Faction Raid voyages
-            GameObjectiveTemplate(
-                label="Complete a(n) FACTION RAID raid voyage",
-                data={
-                    "FACTION": (self.pve_factions, 1),
-                    "RAID": (self.raids, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Emissary grade 5 objectives
-            GameObjectiveTemplate(
-                label="Reach Emissary Rank 5 as FACTION",
-                data={
-                    "FACTION": (self.factions, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=2
-            ),
-            # World Event Objectives
-            GameObjectiveTemplate(
-                label="Complete INT world events",
-                data={
-                    "INT": (functools.partial(self.short_int, 2, 5), 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            GameObjectiveTemplate(
-                label="Complete a(n) WORLD_EVENT world event",
-                data={
-                    "WORLD_EVENT": (self.world_events, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Message in a bottle voyage
-            GameObjectiveTemplate(
-                label="Complete a Message in a Bottle voyage",
-                data={},
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Sunken Kingdom
-            GameObjectiveTemplate(
-                label="Complete the SUNKEN_KINGDOM",
-                data={
-                    "SUNKEN_KINGDOM": (self.sunken_kingdom, 1)
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Sanctuary of the Banished
-            GameObjectiveTemplate(
-                label="Plunder a Santuary of the Banished in the Devil's Roar",
-                data={},
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Big Turn In
-            GameObjectiveTemplate(
-                label="Earn INT gold from a single turn-in",
-                data={
-                    "INT": (functools.partial(self.long_int, 100000, 1000000, 100000), 1)
-                },
-                is_time_consuming=False,
-                is_difficult=True,
-                weight=3
-            ),
-            # Fort of the Damned
-            GameObjectiveTemplate(
-                label="Complete and successfully plunder the Fort of the Damned",
-                data={},
-                is_time_consuming=False,
-                is_difficult=True,
-                weight=3
-            ),
-            # Smuggler's Run
-            GameObjectiveTemplate(
-                label="Successfully complete a Smuggler's Run voyage",
-                data={},
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-            # Orb of Secrets
-            GameObjectiveTemplate(
-                label="Retrieve and sell an Orb of Secrets",
-                data={},
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=3
-            ),
-        ]
+    def game_objective_templates(self) -> Tuple[GameObjectiveTemplate, ...]:
+        if not stats.enabled:
+            return self.catalog.templates
 
-        # Option-based objectives
-        # PVP option
-        if self.include_pvp:
-            template_list = [
-                # Hourglass Matches
-                GameObjectiveTemplate(
-                    label="Win INT hourglass matches as the HG_FACTION",
-                    data={
-                        "INT": (functools.partial(self.short_int, 2, 5), 1),
-                        "HG_FACTION": (self.hg_factions, 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                GameObjectiveTemplate(
-                    label="Send INT enemy pirates to the Ferry of the Damned",
-                    data={
-                        "INT": (functools.partial(self.short_int, 4, 10), 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                # World PVP
-                GameObjectiveTemplate(
-                    label="Sink INT ships outside of Hourglass matches",
-                    data={
-                        "INT": (functools.partial(self.short_int, 2, 5), 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                # Reaper Standard Voyages
-                GameObjectiveTemplate(
-                    label="Complete a Reaper's Bones RB_VOYAGE voyage",
-                    data={
-                        "RB_VOYAGE": (self.rb_voyages, 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                # Siren Skull
-                GameObjectiveTemplate(
-                    label="Sell a Skull of Siren Song",
-                    data={},
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                # Reaper's Chest/Bounty
-                GameObjectiveTemplate(
-                    label="Sell a Reaper's Chest or Reaper's Bounty",
-                    data={},
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-            ]
-            for i in template_list:
-                templates.append(i)
-        # Fishing option
-        if self.include_fishing:
-            template_list = [
-                GameObjectiveTemplate(
-                    label="Catch and sell a FISH",
-                    data={
-                        "FISH": (self.fish, 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                GameObjectiveTemplate(
-                    label="Make INT gold selling fish",
-                    data={
-                        "INT": (functools.partial(self.long_int, 5000, 50000, 5000), 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                )
-            ]
-            for i in template_list:
-                templates.append(i)
-
-        # Tall Tale option
-        if self.include_tall_tales:
-            templates.append(
-                GameObjectiveTemplate(
-                    label="Complete the TALL_TALE Tall Tale",
-                    data={
-                        "TALL_TALE": (self.tall_tales, 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                )
-            )
+        start: float = time.perf_counter()
+        templates: Tuple[GameObjectiveTemplate, ...] = self.catalog.templates
+        stats.record("calls", "game_objective_templates", time.perf_counter() - start)
+
+        return templates
+
+    def generate_objective_batch(
+        self,
+        count: int,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        rng: Optional[Random] = None
+    ) -> List[str]:
+        catalog: SeaOfThievesCatalog = self.catalog
+        objectives: List[SeaOfThievesObjective] = catalog.sample_objectives(
+            count, rng or self.random, include_difficult, include_time_consuming
+        )
+
+        return [catalog.render(objective) for objective in objectives]
+
+    def generate_unique_objectives(
+        self,
+        count: int,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        rng: Optional[Random] = None
+    ) -> List[str]:
+        catalog: SeaOfThievesCatalog = self.catalog
+        objectives: List[SeaOfThievesObjective] = catalog.sample_unique_objectives(
+            count, rng or self.random, include_difficult, include_time_consuming
+        )
+
+        return [catalog.render(objective) for objective in objectives]
+
+    def stream_objectives(
+        self,
+        limit: Optional[int] = None,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        unique: bool = False,
+        rng: Optional[Random] = None
+    ) -> Iterator[SeaOfThievesGeneratedObjective]:
+        """
+        Yields resolved objectives one at a time, forever or up to limit. With unique, stops early once every distinct
+        objective has been produced
+        """
 
-        # Emergent Event option
-        if self.include_emergent_events:
-            templates.append(
-                GameObjectiveTemplate(
-                    label="Defeat a EMERGENT_EVENT",
-                    data={
-                        "EMERGENT_EVENT": (self.emergent_events, 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                )
+        catalog: SeaOfThievesCatalog = self.catalog
+        rng = rng or self.random
+
+        objectives: Iterator[SeaOfThievesObjective]
+        if unique:
+            objectives = itertools.islice(
+                catalog.iter_unique_objectives(rng, include_difficult, include_time_consuming), limit
             )
+        else:
+            objectives = catalog.stream_objectives(rng, include_difficult, include_time_consuming, limit)
 
-        # Social option
-        if self.include_social:
-            template_list = [
-                GameObjectiveTemplate(
-                    label="Make a new friend",
-                    data={},
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                GameObjectiveTemplate(
-                    label="Ride on another crew's ship for INT minutes",
-                    data={
-                        "INT": (functools.partial(self.short_int, 5, 15), 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                ),
-                GameObjectiveTemplate(
-                    label="Form an alliance with INT other ships",
-                    data={
-                        "INT": (functools.partial(self.short_int, 1, 3), 1)
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=3
-                )
-            ]
-            for i in template_list:
-                templates.append(i)
+        for objective in objectives:
+            yield catalog.resolve(objective)
+
+    def generate_compatible_objectives(
+        self,
+        count: int,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        conflict_weight: float = 0.0,
+        rng: Optional[Random] = None
+    ) -> List[str]:
+        catalog: SeaOfThievesCatalog = self.catalog
+        objectives: List[SeaOfThievesObjective] = catalog.sample_compatible_objectives(
+            count, rng or self.random, include_difficult, include_time_consuming, conflict_weight
+        )
+
+        return [catalog.render(objective) for objective in objectives]
+
+    def generate_crew_objectives(
+        self,
+        count: int,
+        registry: SeaOfThievesObjectiveRegistry,
+        slot: Any,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        rng: Optional[Random] = None
+    ) -> List[str]:
+        """
+        Distinct objectives for this slot that complement those already handed to the other slots sharing registry,
+        within its overlap policy. slot identifies this slot in the registry (e.g. the player number). Calling it
+        again with the same slot regenerates this slot's objectives
+        """
+
+        catalog: SeaOfThievesCatalog = self.catalog
+        objectives: List[SeaOfThievesObjective] = registry.assign(
+            slot, catalog, count, rng or self.random, include_difficult, include_time_consuming
+        )
+
+        return [catalog.render(objective) for objective in objectives]
+
+    def plan_session(
+        self,
+        target_minutes: int,
+        count: Optional[int] = None,
+        include_difficult: bool = False,
+        include_time_consuming: bool = False,
+        rng: Optional[Random] = None
+    ) -> Tuple[List[str], int]:
+        """
+        Distinct objectives estimated to fit in target_minutes of play, and their estimated total
+        """
+
+        catalog: SeaOfThievesCatalog = self.catalog
+        plan: SeaOfThievesPlan = catalog.plan_objectives(
+            target_minutes, rng or self.random, count, include_difficult, include_time_consuming
+        )
+
+        return [catalog.render(objective) for objective in plan.objectives], plan.minutes
+
+    @functools.cached_property
+    def option_set(self) -> SeaOfThievesOptionSet:
+        return SeaOfThievesOptionSet(
+            include_pvp=self.include_pvp,
+            include_fishing=self.include_fishing,
+            include_tall_tales=self.include_tall_tales,
+            include_emergent_events=self.include_emergent_events,
+            include_social=self.include_social,
+            owned_content=self.owned_content
+        )
+
+    # Worlds only keep their toggles, their random and a reference to the shared catalog
+    @functools.cached_property
+    def catalog(self) -> SeaOfThievesCatalog:
+        return self.catalog_for(self.option_set)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def catalog_for(cls, option_set: SeaOfThievesOptionSet) -> SeaOfThievesCatalog:
+        return SeaOfThievesCatalog(option_set, cls.build_objective_templates(option_set))
+
+    # Catalog file template groups, in catalog order, with the toggle (if any) each depends on
+    TEMPLATE_GROUPS: Tuple[Tuple[str, Optional[str]], ...] = (
+        ("base", None),
+        ("pvp", "include_pvp"),
+        ("fishing", "include_fishing"),
+        ("tall_tales", "include_tall_tales"),
+        ("emergent_events", "include_emergent_events"),
+        ("social", "include_social"),
+    )
+
+    @classmethod
+    def build_objective_templates(cls, option_set: SeaOfThievesOptionSet) -> List[GameObjectiveTemplate]:
+        faction_groups: Tuple[str, ...] = catalog_data().faction_groups
+        templates: List[GameObjectiveTemplate] = list()
+
+        for group, toggle in cls.TEMPLATE_GROUPS:
+            if toggle is None or getattr(option_set, toggle):
+                templates.extend(cls.template_group(group, option_set.include_pvp and group in faction_groups))
+
+        if option_set.owned_content != ALL_CONTENT:
+            templates = cls.owned_templates(templates, option_set.owned_content)
+
+        if stats.enabled:
+            return stats.instrument_templates(templates)
 
         return templates
 
+    # (id(template), owned_content) -> (template, restricted template or None). Keeping the template pins its id()
+    owned_template_cache: Dict[Tuple[int, int], Tuple[GameObjectiveTemplate, Optional[GameObjectiveTemplate]]] = dict()
+
+    @classmethod
+    def owned_templates(cls, templates: Sequence[GameObjectiveTemplate], owned_content: int) -> List[GameObjectiveTemplate]:
+        """
+        Drops templates needing content the player lacks and restricts pools to owned entries. Templates that are not
+        affected are passed through unchanged, so they stay shared with the full-content catalogs
+        """
+
+        owned: List[GameObjectiveTemplate] = list()
+        for template in templates:
+            key: Tuple[int, int] = (id(template), owned_content)
+            if key not in cls.owned_template_cache:
+                cls.owned_template_cache[key] = (template, cls.owned_template(template, owned_content))
+
+            restricted: Optional[GameObjectiveTemplate] = cls.owned_template_cache[key][1]
+            if restricted is not None:
+                owned.append(restricted)
+
+        return owned
+
+    @staticmethod
+    def owned_template(template: GameObjectiveTemplate, owned_content: int) -> Optional[GameObjectiveTemplate]:
+        if catalog_data().template_content.get(template.label, 0) & ~owned_content:
+            return None
+
+        # Only named catalog pools carry content tags; number ranges and the factions pool pass through as they are
+        data: Dict[str, Tuple[Callable[[], Sequence[Any]], int]] = dict()
+        for key, (collection_callable, count) in template.data.items():
+            if not (isinstance(collection_callable, functools.partial) and collection_callable.func is SeaOfThievesGame.pool):
+                data[key] = (collection_callable, count)
+                continue
+
+            name: str = collection_callable.args[0]
+            entries: Tuple[str, ...] = owned_entries(name, owned_content)
+            if len(entries) < count:
+                return None
+
+            if len(entries) == len(catalog_data().entries[name]):
+                data[key] = (collection_callable, count)
+            else:
+                data[key] = (functools.partial(owned_pool, name, owned_content), count)
+
+        if all(data[key][0] is template.data[key][0] for key in data):
+            return template
+
+        return GameObjectiveTemplate(
+            label=template.label,
+            data=data,
+            is_time_consuming=template.is_time_consuming,
+            is_difficult=template.is_difficult,
+            weight=template.weight
+        )
+
+    # Templates only reference static callables, and each group is built once (once per PVP setting for groups using
+    # the option dependent faction pool), so every catalog including a group shares the same template objects
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def template_group(cls, group: str, include_pvp: bool = False) -> Tuple[GameObjectiveTemplate, ...]:
+        return tuple(
+            GameObjectiveTemplate(
+                label=label,
+                data={key: (cls.pool_callable(reference, include_pvp), 1) for key, reference in data},
+                is_time_consuming=is_time_consuming,
+                is_difficult=is_difficult,
+                weight=weight
+            )
+            for label, data, is_time_consuming, is_difficult, weight in catalog_data().groups.get(group, ())
+        )
+
+    @classmethod
+    def pool_callable(cls, reference: Union[str, Tuple[Any, ...]], include_pvp: bool) -> Callable[[], Sequence[Any]]:
+        if isinstance(reference, tuple):
+            function, *arguments = reference
+            return functools.partial(getattr(cls, function), *arguments)
+
+        if reference == FACTIONS_POOL:
+            return functools.partial(cls.faction_pool, include_pvp)
+
+        return functools.partial(cls.pool, reference)
+
+    @classmethod
+    def clear_catalog_caches(cls) -> None:
+        """
+        Drops every cached catalog, template group and template record, e.g. to benchmark a cold build
+        """
+
+        for cached in (cls.catalog_for, cls.template_group, catalog_data, owned_entries, owned_pool):
+            cached.cache_clear()
+
+        cls.owned_template_cache.clear()
+        SeaOfThievesTemplateRecord.records.clear()
+
     @property
     def include_pvp(self) -> bool:
         return bool(self.archipelago_options.sea_of_thieves_include_pvp.value)
@@ -360,224 +1890,33 @@ class SeaOfThievesGame(Game):
     def include_social(self) -> bool:
         return bool(self.archipelago_options.sea_of_thieves_include_social.value)
 
-    #@functools.cached_property
-    @staticmethod
-    def gh_voyages() -> List[str]:
-        return [
-            "Treasure Map",
-            "Riddle Quest",
-            "Treasure Vault"
-        ]
-    
-    @staticmethod
-    def oos_voyages() -> List[str]:
-        return [
-            "Skeleton Bounty",
-            "Ghost Armada"
-        ]
-    
-    @staticmethod
-    def ma_voyages() -> List[str]:
-        return [
-            "Lost Shipment",
-            "Cargo Run",
-            "Merchant Contract"
-        ]
-    
-    @staticmethod
-    def hc_voyages() -> List[str]:
-        return [
-            "Fishing",
-            "Hunting"
-        ]
-    
-    @staticmethod
-    def rb_voyages() -> List[str]:
-        return [
-            "Ritual",
-            "Search"
-        ]
-    
-    @staticmethod
-    def af_voyages() -> List[str]:
-        return [
-            "Voyage of Legends",
-            "Legend of the Veil",
-            "Legendary Search"
-        ]
-    
-    @staticmethod
-    def short_int(a,b) -> List[str]:
-        return [
-            str(random.randint(a,b))
-        ]
-    
-    @staticmethod
-    def long_int(a,b,c) -> List[str]:
-        return[
-            str(random.randrange(a,b+1,c))
-        ]
-    
-    @staticmethod
-    def world_events() -> List[str]:
-        return[
-            "Skeleton Fort",
-            "Skeleteon Fleet",
-            "Reaper Fortress",
-            "Fort of Fortune",
-            "Ghost Fleet",
-            "Ashen Winds"
-        ]
-    
+    @property
+    def owned_content(self) -> int:
+        return content_mask(sorted(self.archipelago_options.sea_of_thieves_owned_content.value))
+
     @staticmethod
-    def sunken_kingdom() -> List[str]:
-        return[
-            "Shrine of the Coral Tomb",
-            "Shrine of Ocean's Fortune",
-            "Shrine of Ancient Tears",
-            "Shrine of Tribute",
-            "Shrine of Hungering",
-            "Shrine of Flooded Embrace",
-            "Treasury of Sunken Shores",
-            "Treasury of the Lost Ancients",
-            "Treasury of the Secret Wilds"
-        ]
-    
-    @functools.cached_property
-    def base_factions(self) -> List[str]:
-        return [
-            "Gold Hoarders",
-            "Order of Souls",
-            "Merchant Alliance",
-            "Hunter's Call",
-            "Athena's Fortune"
-        ]
-    
-    @functools.cached_property
-    def pvp_factions(self) -> List[str]:
-        return[
-            "Reaper's Bones"
-        ]
-    
-    def pve_factions(self) -> List[str]:
-        pve_factions: List[str] = self.base_factions[:]
+    def pool(name: str) -> Sequence[str]:
+        return catalog_data().pools[name]
 
-        return pve_factions
+    # Number ranges are returned whole so the value is drawn by the world's seeded random, never the global one.
+    # Descriptors are immutable, so each distinct range is built once
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def short_int(a,b) -> SeaOfThievesRange:
+        return SeaOfThievesRange(a, b)
 
-    def factions(self) -> List[str]:
-        factions: List[str] = self.base_factions[:]
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def long_int(a,b,c) -> SeaOfThievesRange:
+        return SeaOfThievesRange(a, b, c)
 
-        if self.include_pvp:
-            factions.extend(self.pvp_factions)
+    @staticmethod
+    def faction_pool(include_pvp: bool) -> Sequence[str]:
+        if include_pvp:
+            return catalog_data().all_factions
 
-        return factions
+        return catalog_data().pools["base_factions"]
 
-    @staticmethod
-    def raids() -> List[str]:
-        return [
-            "Sea Fort",
-            "Skeleton Camp",
-            "Ashen Lord",
-            "Skeleton Armada",
-            "Ghost Fleet",
-            "Skeleton Fort"
-        ]
-    
-    @staticmethod
-    def hg_factions() -> List[str]:
-        return [
-            "Guardians of Fortune",
-            "Servants of the Flame"
-        ]
-    
-    @staticmethod
-    def fish() -> List[str]:
-        return[
-            "Ruby Splashtail",
-            "Sunny Splashtail",
-            "Indigo Splashtail",
-            "Umber Splashtail",
-            "Seafoam Splashtail",
-            "Charcoal Pondie",
-            "Orchid Pondie",
-            "Bronze Pondie",
-            "Bright Pondie",
-            "Moonsky Pondie",
-            "Stone Islehopper",
-            "Moss Islehopper",
-            "Honey Islehopper",
-            "Raven Islehopper",
-            "Amethyst Islehopper",
-            "Almond Ancientscale",
-            "Sapphire Ancientscale",
-            "Smoke Ancientscale",
-            "Bone Ancientscale",
-            "Starshine Ancientscale",
-            "Olive Plentifin",
-            "Amber Plentifin",
-            "Cloudy Plentifin",
-            "Bonedust Plentifin",
-            "Watery Plentifin",
-            "Russet Wildsplash",
-            "Sandy Wildsplash",
-            "Ocean Wildsplash",
-            "Muddy Wildsplash",
-            "Coral Wildsplash",
-            "Ashen Devilfish",
-            "Seashell Devilfish",
-            "Lava Devilfish",
-            "Forsaken Devilfish",
-            "Firelight Devilfish",
-            "Jade Battlegill",
-            "Sky Battlegill",
-            "Rum Battlegill",
-            "Sand Battlegill",
-            "Bittersweet Battlegill",
-            "Rose Wrecker",
-            "Sun Wrecker",
-            "Blackcloud Wrecker",
-            "Snow Wrecker",
-            "Moon Wrecker",
-            "Ancient Stormfish",
-            "Shores Stormfish",
-            "Wild Stormfish",
-            "Shadow Stormfish",
-            "Twilight Stormfish"
-        ]
-    
-    @staticmethod
-    def tall_tales() -> List[str]:
-        return [
-            "The Shroudbreaker",
-            "The Cursed Rogue",
-            "The Legendary Storyteller",
-            "Stars of a Thief",
-            "Wild Rose",
-            "The Art of the Trickster",
-            "The Fate of the Morningstar",
-            "Revenge of the Morningstar",
-            "Shores of Gold",
-            "The Seabound Soul",
-            "Heart of Fire",
-            "A Pirate's Life",
-            "The Sunken Pearl",
-            "Captains of the Damned",
-            "Dark Brethren",
-            "Lords of the Sea",
-            "Journey to Melee Island",
-            "The Quest for Guybrush",
-            "The Lair of LeChuck"
-        ]
-    
-    @staticmethod
-    def emergent_events() -> List[str]:
-        return [
-            "Kraken",
-            "Megalodon",
-            "Skeleton Sloop",
-            "Skeleton Galleon"
-        ]
-    
 # Archipelago Options
 class SeaOfThievesIncludePVP(Toggle):
     """
@@ -612,4 +1951,13 @@ class SeaOfThievesIncludeSocial(Toggle):
     Indicates whether more 'social' checks should be included. Sea of Thieves is a social game, and incentivizing this can be a lot of fun! These objectives may be fairly subjective.
     """
 
-    display_name = "Sea of Thieves Social Objectives"
\ No newline at end of file
+    display_name = "Sea of Thieves Social Objectives"
+
+class SeaOfThievesOwnedContent(OptionSet):
+    """
+    Which optional Sea of Thieves content you have access to. Objectives needing anything missing here are not generated
+    """
+
+    display_name = "Sea of Thieves Owned Content"
+    valid_keys = frozenset(CONTENT)
+    default = frozenset(CONTENT)
\ No newline at end of file
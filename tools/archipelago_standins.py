@@ -0,0 +1,178 @@
+"""
+Minimal stand-ins for the Archipelago and Keymaster's Keep pieces sea_of_thieves_game.py imports, so the game module
+can be loaded and exercised from a plain Python install. Mirrors the parts of the real classes the module relies on.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import itertools
+import os
+import sys
+import tempfile
+import types
+
+from dataclasses import dataclass
+from enum import Enum
+from random import Random
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+PACKAGE: str = "keymasters_keep"
+MODULE: str = f"{PACKAGE}.games.sea_of_thieves_game"
+MODULE_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sea_of_thieves_game.py")
+
+OPTION_FIELDS: Tuple[str, ...] = (
+    "sea_of_thieves_include_pvp",
+    "sea_of_thieves_include_fishing",
+    "sea_of_thieves_include_tall_tales",
+    "sea_of_thieves_include_emergent_events",
+    "sea_of_thieves_include_social",
+)
+
+
+class Toggle:
+    default: int = 0
+
+    def __init__(self, value: int = 0) -> None:
+        self.value = int(value)
+
+
+class OptionSet:
+    default: frozenset = frozenset()
+
+    def __init__(self, value: Optional[Iterable[str]] = None) -> None:
+        self.value = set(self.default if value is None else value)
+
+
+def cache_path(*path: str) -> str:
+    return os.path.join(tempfile.gettempdir(), "archipelago-standins", "cache", *path)
+
+
+class KeymastersKeepGamePlatforms(Enum):
+    PC = "PC"
+    XONE = "XONE"
+    XSX = "XSX"
+    PS5 = "PS5"
+
+
+@dataclass
+class GameObjectiveTemplate:
+    label: str
+    data: Dict[str, Tuple[Callable[[], List[Any]], int]]
+    is_time_consuming: bool = False
+    is_difficult: bool = False
+    weight: int = 1
+
+    def generate_game_objective(self, random: Random) -> str:
+        label: str = self.label
+
+        for key, (collection_callable, count) in self.data.items():
+            objective_data: List[Any] = random.sample(collection_callable(), count)
+            label = label.replace(key, ", ".join(str(x) for x in objective_data), 1)
+
+        return label
+
+
+class Game:
+    name: str
+    options_cls: Any = None
+
+    def __init__(
+        self,
+        random: Optional[Random] = None,
+        include_time_consuming_objectives: bool = False,
+        include_difficult_objectives: bool = False,
+        archipelago_options: Any = None,
+    ) -> None:
+        self.random = random or Random()
+        self.include_time_consuming_objectives = include_time_consuming_objectives
+        self.include_difficult_objectives = include_difficult_objectives
+        self.archipelago_options = archipelago_options
+
+
+def install() -> None:
+    """
+    Registers the stand-in modules. Real Archipelago Options and Utils modules already on the path are left alone
+    """
+
+    if "Options" not in sys.modules:
+        options = types.ModuleType("Options")
+        options.Toggle = Toggle
+        options.OptionSet = OptionSet
+        sys.modules["Options"] = options
+
+    if "Utils" not in sys.modules:
+        utils = types.ModuleType("Utils")
+        utils.cache_path = cache_path
+        sys.modules["Utils"] = utils
+
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = []
+    games = types.ModuleType(f"{PACKAGE}.games")
+    games.__path__ = [os.path.dirname(MODULE_PATH)]
+
+    game = types.ModuleType(f"{PACKAGE}.game")
+    game.Game = Game
+    game_objective_template = types.ModuleType(f"{PACKAGE}.game_objective_template")
+    game_objective_template.GameObjectiveTemplate = GameObjectiveTemplate
+    enums = types.ModuleType(f"{PACKAGE}.enums")
+    enums.KeymastersKeepGamePlatforms = KeymastersKeepGamePlatforms
+
+    for module in (package, games, game, game_objective_template, enums):
+        sys.modules.setdefault(module.__name__, module)
+
+
+def load_sea_of_thieves_game() -> types.ModuleType:
+    if MODULE in sys.modules:
+        return sys.modules[MODULE]
+
+    install()
+
+    spec = importlib.util.spec_from_file_location(MODULE, MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[MODULE] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def all_option_values() -> Iterator[Tuple[bool, ...]]:
+    """
+    The 32 on/off combinations of the SoT toggles, in OPTION_FIELDS order
+    """
+
+    return itertools.product((False, True), repeat=len(OPTION_FIELDS))
+
+
+def make_options(values: Tuple[bool, ...], owned_content: Optional[Iterable[str]] = None) -> Any:
+    """
+    Options for the given toggles (OPTION_FIELDS order) and owned content, all content by default
+    """
+
+    module: types.ModuleType = load_sea_of_thieves_game()
+    toggles = [option_cls(int(value)) for option_cls, value in zip(option_classes(module), values)]
+
+    return module.SeaOfThievesArchipelagoOptions(*toggles, module.SeaOfThievesOwnedContent(owned_content))
+
+
+def option_classes(module: types.ModuleType) -> Tuple[type, ...]:
+    return (
+        module.SeaOfThievesIncludePVP,
+        module.SeaOfThievesIncludeFish,
+        module.SeaOfThievesIncludeTallTales,
+        module.SeaOfThievesIncludeEmergentEvents,
+        module.SeaOfThievesIncludeSocial,
+    )
+
+
+def make_game(
+    values: Tuple[bool, ...], seed: Optional[int] = None, owned_content: Optional[Iterable[str]] = None
+) -> Any:
+    module: types.ModuleType = load_sea_of_thieves_game()
+
+    return module.SeaOfThievesGame(
+        random=Random(seed),
+        include_time_consuming_objectives=True,
+        include_difficult_objectives=True,
+        archipelago_options=make_options(values, owned_content),
+    )
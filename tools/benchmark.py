@@ -0,0 +1,167 @@
+"""
+Throughput and memory benchmark for sea_of_thieves_game.py, run against the local Archipelago stand-ins.
+
+    python tools/benchmark.py [--objectives 20000] [--repeat 3] [--json]
+
+For every one of the 32 option combinations it reports templates built per second (cold catalog construction),
+cached template queries per second, objectives resolved per second through both the Keymaster's Keep path
+(GameObjectiveTemplate.generate_game_objective) and the batch sampler, and peak traced memory.
+
+Import cost is measured in fresh interpreters: executing the module body from already compiled code (Archipelago loads
+cached bytecode, so compiling is not part of each startup), the modules that import pulls in beyond the stand-ins, and
+the deferred cost paid by the first catalog a SoT slot builds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from random import Random
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import archipelago_standins  # noqa: E402
+
+IMPORT_PROBE: str = """
+import importlib.util, json, sys, time
+sys.path.insert(0, {tools!r})
+import archipelago_standins
+archipelago_standins.install()
+spec = importlib.util.spec_from_file_location(archipelago_standins.MODULE, archipelago_standins.MODULE_PATH)
+code = spec.loader.get_code(spec.name)
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+loaded = set(sys.modules)
+start = time.perf_counter()
+exec(code, module.__dict__)
+imported = time.perf_counter() - start
+modules = sorted(set(sys.modules) - loaded)
+start = time.perf_counter()
+archipelago_standins.make_game((True,) * len(archipelago_standins.OPTION_FIELDS), seed=0).catalog
+print(json.dumps([imported, time.perf_counter() - start, modules]))
+"""
+
+
+def best_rate(operation: Callable[[], int], repeat: int) -> float:
+    """
+    Runs operation repeat times and returns the best items/second, operation returning how many items it produced
+    """
+
+    rates: List[float] = list()
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        items: int = operation()
+        rates.append(items / max(time.perf_counter() - start, 1e-9))
+
+    return max(rates)
+
+
+def measure_import(repeat: int) -> Dict[str, Any]:
+    tools: str = os.path.dirname(os.path.abspath(__file__))
+    samples: List[float] = list()
+    first_use: List[float] = list()
+    modules: List[str] = list()
+
+    for _ in range(repeat):
+        output: str = subprocess.check_output([sys.executable, "-c", IMPORT_PROBE.format(tools=tools)], text=True)
+        imported, first_catalog, modules = json.loads(output.strip().splitlines()[-1])
+        samples.append(imported)
+        first_use.append(first_catalog)
+
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "min_ms": min(samples) * 1000,
+        "first_catalog_median_ms": statistics.median(first_use) * 1000,
+        "modules": modules,
+    }
+
+
+def measure_combination(values: Tuple[bool, ...], objectives: int, repeat: int) -> Dict[str, Any]:
+    module = archipelago_standins.load_sea_of_thieves_game()
+    game = archipelago_standins.make_game(values, seed=0)
+    option_set = game.option_set
+    templates = game.game_objective_templates()
+    rng: Random = Random(0)
+
+    def build() -> int:
+        built: int = 0
+        for _ in range(50):
+            module.SeaOfThievesGame.clear_catalog_caches()
+            built += len(module.SeaOfThievesGame.catalog_for(option_set).templates)
+        return built
+
+    def query() -> int:
+        for _ in range(10000):
+            game.game_objective_templates()
+        return 10000
+
+    def resolve_single() -> int:
+        for i in range(objectives):
+            templates[i % len(templates)].generate_game_objective(rng)
+        return objectives
+
+    def resolve_batch() -> int:
+        return len(game.generate_objective_batch(objectives, True, True, rng))
+
+    tracemalloc.start()
+    module.SeaOfThievesGame.clear_catalog_caches()
+    archipelago_standins.make_game(values, seed=0).generate_objective_batch(objectives, True, True)
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "options": dict(zip(archipelago_standins.OPTION_FIELDS, values)),
+        "templates": len(templates),
+        "templates_built_per_s": best_rate(build, repeat),
+        "template_queries_per_s": best_rate(query, repeat),
+        "objectives_resolved_per_s": best_rate(resolve_single, repeat),
+        "batch_objectives_per_s": best_rate(resolve_batch, repeat),
+        "peak_kib": peak / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--objectives", type=int, default=20000, help="objectives resolved per measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, best is reported")
+    parser.add_argument("--json", action="store_true", help="emit a JSON report instead of a table")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "import": measure_import(max(args.repeat, 5)),
+        "combinations": [
+            measure_combination(values, args.objectives, args.repeat)
+            for values in archipelago_standins.all_option_values()
+        ],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    imports: Dict[str, Any] = report["import"]
+    print(
+        f"import: {imports['median_ms']:.2f} ms median, {imports['min_ms']:.2f} ms best, "
+        f"{len(imports['modules'])} modules pulled in{': ' + ', '.join(imports['modules']) if imports['modules'] else ''}"
+    )
+    print(f"first catalog: {imports['first_catalog_median_ms']:.2f} ms median")
+    print(f"{'options':<8}{'templates':>10}{'built/s':>12}{'queries/s':>14}{'resolved/s':>13}{'batch/s':>12}{'peak KiB':>10}")
+    for result in report["combinations"]:
+        flags: str = "".join("1" if value else "0" for value in result["options"].values())
+        print(
+            f"{flags:<8}{result['templates']:>10}{result['templates_built_per_s']:>12,.0f}"
+            f"{result['template_queries_per_s']:>14,.0f}{result['objectives_resolved_per_s']:>13,.0f}"
+            f"{result['batch_objectives_per_s']:>12,.0f}{result['peak_kib']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
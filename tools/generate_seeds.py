@@ -0,0 +1,88 @@
+"""
+Generates Sea of Thieves objective sets for many seeds across a process pool, streamed as JSON lines in seed order.
+
+    python tools/generate_seeds.py --seeds 10000 --objectives 40 --options 11111 --workers 8 -o keeps.jsonl
+
+Every seed gets its own SeaOfThievesGame seeded with Random(seed), so a seed's output is identical no matter how many
+workers run or which worker handles it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import archipelago_standins  # noqa: E402
+
+
+def parse_options(flags: str) -> Tuple[bool, ...]:
+    if len(flags) != len(archipelago_standins.OPTION_FIELDS) or set(flags) - {"0", "1"}:
+        raise argparse.ArgumentTypeError(
+            f"expected {len(archipelago_standins.OPTION_FIELDS)} 0/1 flags in the order "
+            + ", ".join(archipelago_standins.OPTION_FIELDS)
+        )
+
+    return tuple(flag == "1" for flag in flags)
+
+
+def generate(job: Tuple[int, Tuple[bool, ...], int, bool, bool, bool]) -> Dict[str, Any]:
+    seed, options, objectives, unique, include_difficult, include_time_consuming = job
+    game = archipelago_standins.make_game(options, seed=seed)
+
+    labels: List[str]
+    if unique:
+        labels = game.generate_unique_objectives(objectives, include_difficult, include_time_consuming)
+    else:
+        labels = game.generate_objective_batch(objectives, include_difficult, include_time_consuming)
+
+    return {"seed": seed, "objectives": labels}
+
+
+def run(args: argparse.Namespace) -> Iterator[Dict[str, Any]]:
+    jobs: Iterator[Tuple[int, Tuple[bool, ...], int, bool, bool, bool]] = (
+        (seed, args.options, args.objectives, args.unique, args.include_difficult, args.include_time_consuming)
+        for seed in range(args.start, args.start + args.seeds)
+    )
+
+    if args.workers <= 1:
+        archipelago_standins.load_sea_of_thieves_game()
+        yield from map(generate, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=archipelago_standins.load_sea_of_thieves_game) as pool:
+        # map() hands results back in submission order, so output order is independent of scheduling
+        yield from pool.map(generate, jobs, chunksize=args.chunksize)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=1000, help="number of seeds to generate")
+    parser.add_argument("--start", type=int, default=0, help="first seed")
+    parser.add_argument("--objectives", type=int, default=40, help="objectives per seed")
+    parser.add_argument("--options", type=parse_options, default=(True,) * 5, help="SoT toggles as 5 0/1 flags")
+    parser.add_argument("--unique", action="store_true", help="no repeated objectives within a seed")
+    parser.add_argument("--include-difficult", action="store_true")
+    parser.add_argument("--include-time-consuming", action="store_true")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=64, help="seeds handed to a worker at a time")
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    args = parser.parse_args()
+
+    output: TextIO = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for result in run(args):
+            output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
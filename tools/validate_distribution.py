@@ -0,0 +1,238 @@
+"""
+Monte Carlo check of the Sea of Thieves objective distribution, run against the local Archipelago stand-ins.
+
+    python tools/validate_distribution.py [--options 11111 | --all] [--draws 1000000] [--strict]
+
+Draws objectives with the catalog's batch sampler and chi-square tests observed template frequencies against their
+weights, and each placeholder's entry frequencies against its pool's entry weights (uniform for unweighted pools). The
+entry frequencies are tested again on draws through Keymaster's Keep's own path, generate_game_objective(), which
+random.sample()s the templates' data callables. It also reports catalog anomalies: entries repeated within a pool,
+entries shared by pools of different placeholders (e.g. "Ghost Fleet" in both world events and raids), repeated labels
+and placeholders missing from their label. Exits non-zero when a test fails, or on any anomaly with --strict.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import time
+
+from collections import Counter
+from random import Random
+from typing import Any, Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import archipelago_standins  # noqa: E402
+from generate_seeds import parse_options  # noqa: E402
+
+CHUNK: int = 100000
+
+
+def chi_square(observed: Sequence[int], expected: Sequence[float]) -> Tuple[float, int, float]:
+    """
+    Pearson statistic, degrees of freedom and upper tail p-value (Wilson-Hilferty approximation)
+    """
+
+    statistic: float = sum((o - e) ** 2 / e for o, e in zip(observed, expected) if e > 0)
+    dof: int = len(observed) - 1
+
+    if dof < 1:
+        return statistic, dof, 1.0
+
+    z: float = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+
+    return statistic, dof, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def anomalies(catalog: Any) -> List[str]:
+    module = archipelago_standins.load_sea_of_thieves_game()
+    found: List[str] = list()
+
+    labels: Counter = Counter(template.label for template in catalog.templates)
+    found.extend(f"label used by {count} templates: {label!r}" for label, count in labels.items() if count > 1)
+
+    pools: Dict[int, Tuple[str, Sequence[Any]]] = dict()
+    for record in catalog.records:
+        missing: List[str] = [
+            key for slot, key in enumerate(record.keys) if slot not in record.label.slot_order
+        ]
+        found.extend(f"placeholder {key} does not appear in {record.template.label!r}" for key in missing)
+
+        for key, pool in zip(record.keys, record.pools):
+            if not isinstance(pool, module.SeaOfThievesRange):
+                pools.setdefault(id(pool), (key, pool))
+
+    owners: Dict[str, set] = dict()
+    for key, pool in pools.values():
+        for entry, count in Counter(pool).items():
+            if count > 1:
+                found.append(f"{entry!r} appears {count} times in the {key} pool")
+            owners.setdefault(entry, set()).add(key)
+
+    found.extend(
+        f"{entry!r} is in the pools of " + ", ".join(sorted(keys))
+        for entry, keys in owners.items() if len(keys) > 1
+    )
+
+    return found
+
+
+class RecordingRandom(Random):
+    """
+    Random that keeps what each sample() call picked, so the data drawn by generate_game_objective() can be counted
+    without parsing it back out of the label
+    """
+
+    def __init__(self, seed: int) -> None:
+        super().__init__(seed)
+        self.picks: List[List[Any]] = list()
+
+    def sample(self, population: Any, k: int, **kwargs: Any) -> List[Any]:
+        picked: List[Any] = super().sample(population, k, **kwargs)
+        self.picks.append(picked)
+
+        return picked
+
+
+def entry_tests(
+    record: Any,
+    name: str,
+    counts: Sequence[Counter],
+    total: int
+) -> List[Tuple[str, Sequence[int], Sequence[float]]]:
+    tests: List[Tuple[str, Sequence[int], Sequence[float]]] = list()
+
+    for slot, (radix, cum_weights) in enumerate(zip(record.radices, record.cum_weights)):
+        weights: List[int] = [1] * radix
+        if cum_weights is not None:
+            weights = [weight - previous for previous, weight in zip((0,) + cum_weights, cum_weights)]
+
+        tests.append((
+            f"{record.keys[slot]} in {record.template.label!r}{name}",
+            [counts[slot][index] for index in range(radix)],
+            [total * weight / sum(weights) for weight in weights],
+        ))
+
+    return tests
+
+
+def keep_draws(module: Any, record: Any, draws: int, rng: RecordingRandom) -> Tuple[List[Counter], List[str]]:
+    """
+    Entry counts per placeholder over draws calls to the template's generate_game_objective(), and any drawn values
+    missing from the placeholder's pool
+    """
+
+    positions: List[Any] = [
+        pool if isinstance(pool, module.SeaOfThievesRange) else {entry: index for index, entry in enumerate(pool)}
+        for pool in record.pools
+    ]
+    counts: List[Counter] = [Counter() for _ in record.keys]
+    strays: List[str] = list()
+
+    for _ in range(draws):
+        rng.picks.clear()
+        record.template.generate_game_objective(rng)
+
+        for slot, (picked,) in enumerate(rng.picks):
+            if isinstance(positions[slot], module.SeaOfThievesRange):
+                if picked in positions[slot]:
+                    counts[slot][positions[slot].rank(picked)] += 1
+                    continue
+            elif picked in positions[slot]:
+                counts[slot][positions[slot][picked]] += 1
+                continue
+
+            strays.append(f"{record.keys[slot]} in {record.template.label!r} drew {picked!r}, which is not in its pool")
+
+    return counts, strays
+
+
+def validate(values: Tuple[bool, ...], draws: int, seed: int, alpha: float) -> Tuple[List[str], List[str]]:
+    game = archipelago_standins.make_game(values, seed=seed)
+    catalog = game.catalog
+    rng: Random = Random(seed)
+
+    observed: Counter = Counter()
+    remaining: int = draws
+    while remaining > 0:
+        observed.update(catalog.sample_objectives(min(CHUNK, remaining), rng, True, True))
+        remaining -= CHUNK
+
+    per_template: Counter = Counter()
+    per_slot: Dict[Tuple[int, int], Counter] = dict()
+    for objective, count in observed.items():
+        per_template[objective.template_id] += count
+        for slot, index in enumerate(objective.data):
+            per_slot.setdefault((objective.template_id, slot), Counter())[index] += count
+
+    bucket = catalog.filtered_buckets[(True, True)]
+    tests: List[Tuple[str, Sequence[int], Sequence[float]]] = [(
+        "template weights",
+        [per_template[template_id] for template_id in bucket.template_ids],
+        [draws * catalog.records[template_id].weight / bucket.total_weight for template_id in bucket.template_ids],
+    )]
+
+    for template_id in bucket.template_ids:
+        record = catalog.records[template_id]
+        counts: List[Counter] = [per_slot.get((template_id, slot), Counter()) for slot in range(len(record.keys))]
+        tests.extend(entry_tests(record, "", counts, per_template[template_id]))
+
+    # The same entry tests on Keymaster's Keep's path, each template drawn as often as its weight would have it
+    module = archipelago_standins.load_sea_of_thieves_game()
+    keep_rng: RecordingRandom = RecordingRandom(seed)
+    failures: List[str] = list()
+    for template_id in bucket.template_ids:
+        record = catalog.records[template_id]
+        if not record.keys:
+            continue
+
+        template_draws: int = max(1, round(draws * record.weight / bucket.total_weight))
+        counts, strays = keep_draws(module, record, template_draws, keep_rng)
+        failures.extend(strays)
+        tests.extend(entry_tests(record, " (generate_game_objective)", counts, template_draws))
+
+    # Bonferroni, so the whole report holds at alpha
+    threshold: float = alpha / len(tests)
+    for name, observed_counts, expected_counts in tests:
+        statistic, dof, p_value = chi_square(observed_counts, expected_counts)
+        if p_value < threshold:
+            failures.append(f"{name}: chi2={statistic:.1f} dof={dof} p={p_value:.2e}")
+
+    return failures, anomalies(catalog)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--options", type=parse_options, default=(True,) * 5, help="SoT toggles as 5 0/1 flags")
+    parser.add_argument("--all", action="store_true", help="check all 32 option combinations")
+    parser.add_argument("--draws", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--alpha", type=float, default=0.001, help="family-wise significance level")
+    parser.add_argument("--strict", action="store_true", help="treat catalog anomalies as failures")
+    args = parser.parse_args()
+
+    combinations: List[Tuple[bool, ...]] = list(archipelago_standins.all_option_values()) if args.all else [args.options]
+
+    failed: bool = False
+    for values in combinations:
+        start: float = time.perf_counter()
+        failures, warnings = validate(values, args.draws, args.seed, args.alpha)
+        flags: str = "".join("1" if value else "0" for value in values)
+
+        status: str = "FAIL" if failures or (args.strict and warnings) else "ok"
+        print(f"{flags}: {status} ({args.draws:,} draws in {time.perf_counter() - start:.1f}s)")
+        for failure in failures:
+            print(f"  chi-square: {failure}")
+        for warning in warnings:
+            print(f"  anomaly: {warning}")
+
+        failed = failed or status == "FAIL"
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()